@@ -1,12 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
-import httpx
+from datetime import date, datetime, timedelta
+import asyncio
+import json
 from core.config import settings
-from core.database import get_db_session
-from models import Sprint, SprintDistraction
-from sqlalchemy.orm import Session
+from core.database import get_async_db
+from core.auth import request_owner, owned_by
+from core.mcp_client import mcp_client, MCPClientError
+from core.pagination import encode_cursor, decode_cursor, keyset_condition
+from core.fast_json import FastJSONResponse, rows_to_dicts
+from core.http_cache import make_etag, conditional_response, not_modified
+from core.collection_versions import collection_versions
+from core.ritual_cache import ritual_cache
+from core.events import sprint_events
+from core.distraction_queue import distraction_queue
+from core.sprint_scheduler import sprint_scheduler
+from core.sprint_stats import COUNTERS, apply_rollup_delta, contribution_of, difference, rollup_owner
+from models import Sprint, SprintDistraction, SprintRollup, Ritual
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload
 
 router = APIRouter()
 
@@ -27,21 +42,70 @@ class SprintResponse(BaseModel):
     distractions: List[str] = []
 
 
+# SprintResponse fields, in order, as selected for the sprint history page
+SPRINT_PAGE_FIELDS = ("id", "task", "duration_minutes", "start_time", "end_time", "status")
+
+
+class SprintPage(BaseModel):
+    sprints: List[SprintResponse]
+    next_cursor: Optional[str] = None
+
+
+class SprintStatsPeriod(BaseModel):
+    period_start: date
+    sprints_started: int = 0
+    sprints_completed: int = 0
+    sprints_expired: int = 0
+    sprints_overran: int = 0
+    planned_minutes: float = 0.0
+    focus_minutes: float = 0.0
+    overrun_minutes: float = 0.0
+    distractions: int = 0
+    completion_rate: float = 0.0
+    distractions_per_sprint: float = 0.0
+    average_overrun_minutes: float = 0.0
+
+
+class SprintStats(BaseModel):
+    days: List[SprintStatsPeriod]
+    weeks: List[SprintStatsPeriod]
+    summary: SprintStatsPeriod
+
+
 class MCPToolRequest(BaseModel):
     tool_name: str
     parameters: dict
 
 
+class MCPBatchRequest(BaseModel):
+    requests: List[MCPToolRequest]
+    max_parallel: Optional[int] = None
+    stream: bool = False
+
+
+async def _get_owned_sprint(db: AsyncSession, sprint_id: str, owner_id: Optional[str]) -> Sprint:
+    """The sprint, or a 404 if it doesn't exist in the caller's scope"""
+    sprint = await db.get(Sprint, sprint_id)
+    if not sprint or sprint.owner_id != owner_id:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    return sprint
+
+
 @router.post("/sprint/start", response_model=SprintResponse)
-async def start_sprint(request: SprintRequest, db: Session = Depends(get_db_session)):
+async def start_sprint(
+    request: SprintRequest,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Start a new sprint session"""
     try:
         # Create sprint session
         start_time = datetime.now()
-        end_time = start_time.replace(minute=start_time.minute + request.duration_minutes)
+        end_time = start_time + timedelta(minutes=request.duration_minutes)
         
         # Create Sprint object and save to database
         sprint = Sprint(
+            owner_id=owner_id,
             task=request.task,
             description=request.description,
             duration_minutes=request.duration_minutes,
@@ -51,11 +115,10 @@ async def start_sprint(request: SprintRequest, db: Session = Depends(get_db_sess
         )
         
         db.add(sprint)
-        db.commit()
-        db.refresh(sprint)
+        await apply_rollup_delta(db, sprint.start_time, contribution_of(sprint), owner_id)
+        await db.commit()
         
-        # Return response
-        return SprintResponse(
+        response = SprintResponse(
             id=sprint.id,
             task=sprint.task,
             duration_minutes=sprint.duration_minutes,
@@ -64,16 +127,29 @@ async def start_sprint(request: SprintRequest, db: Session = Depends(get_db_sess
             status=sprint.status,
             distractions=[]
         )
+        sprint_events.publish("sprint.started", response, owner_id)
+        sprint_scheduler.schedule_sprint(sprint.id, sprint.task, sprint.start_time, sprint.end_time, owner_id)
+        return response
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to start sprint: {str(e)}")
 
 
 @router.get("/sprint/active")
-async def get_active_sprint(db: Session = Depends(get_db_session)):
+async def get_active_sprint(
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get the currently active sprint"""
     try:
-        active_sprint = db.query(Sprint).filter(Sprint.status == "active").order_by(Sprint.created_at.desc()).first()
+        result = await db.execute(
+            select(Sprint)
+            .options(selectinload(Sprint.distractions))
+            .filter(owned_by(Sprint.owner_id, owner_id), Sprint.status == "active")
+            .order_by(Sprint.created_at.desc())
+            .limit(1)
+        )
+        active_sprint = result.scalars().first()
         if not active_sprint:
             return {"message": "No active sprint"}
         
@@ -93,99 +169,255 @@ async def get_active_sprint(db: Session = Depends(get_db_session)):
         raise HTTPException(status_code=500, detail=f"Failed to get active sprint: {str(e)}")
 
 
-@router.get("/sprint/all")
-async def get_all_sprints(db: Session = Depends(get_db_session)):
-    """Get all sprints"""
+@router.get("/sprint/all", response_model=SprintPage)
+async def get_all_sprints(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get sprints, newest first, one keyset-paginated page at a time (ETag / 304 aware)"""
+    etag = collection_versions.etag("sprints", owner_id, request.url.query)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    sort_columns = (Sprint.created_at, Sprint.id)
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, len(sort_columns))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
     try:
-        sprints = db.query(Sprint).order_by(Sprint.created_at.desc()).all()
-        return [
-            SprintResponse(
-                id=sprint.id,
-                task=sprint.task,
-                duration_minutes=sprint.duration_minutes,
-                start_time=sprint.start_time,
-                end_time=sprint.end_time,
-                status=sprint.status,
-                distractions=[d.distraction for d in sprint.distractions]
+        # Column tuples rather than ORM objects; created_at is only for the cursor
+        query = (
+            select(*(getattr(Sprint, name) for name in SPRINT_PAGE_FIELDS), Sprint.created_at)
+            .filter(owned_by(Sprint.owner_id, owner_id))
+            .order_by(Sprint.created_at.desc(), Sprint.id.desc())
+            .limit(limit + 1)
+        )
+        if after:
+            query = query.filter(keyset_condition(sort_columns, after, (True, True)))
+
+        # One query for the page plus one IN query for all its distractions
+        rows = (await db.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor([last.created_at, last.id])
+
+        sprints = rows_to_dicts(SPRINT_PAGE_FIELDS, rows)
+        by_id = {}
+        for sprint in sprints:
+            sprint["distractions"] = by_id[sprint["id"]] = []
+        if by_id:
+            distractions = await db.execute(
+                select(SprintDistraction.sprint_id, SprintDistraction.distraction)
+                .where(SprintDistraction.sprint_id.in_(list(by_id)))
             )
-            for sprint in sprints
-        ]
+            for sprint_id, distraction in distractions:
+                by_id[sprint_id].append(distraction)
+
+        return FastJSONResponse(
+            {"sprints": sprints, "next_cursor": next_cursor},
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get sprints: {str(e)}")
 
 
+def _stats_period(period_start: date, counters: dict) -> SprintStatsPeriod:
+    started = counters.get("sprints_started", 0)
+    completed = counters.get("sprints_completed", 0)
+    return SprintStatsPeriod(
+        period_start=period_start,
+        **counters,
+        completion_rate=completed / started if started else 0.0,
+        distractions_per_sprint=counters.get("distractions", 0) / started if started else 0.0,
+        average_overrun_minutes=counters.get("overrun_minutes", 0.0) / completed if completed else 0.0
+    )
+
+
+@router.get("/sprint/stats", response_model=SprintStats)
+async def get_sprint_stats(
+    days: int = Query(7, ge=1, le=366),
+    weeks: int = Query(4, ge=1, le=104),
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Focus statistics of the caller's sprints per day and ISO week, read from the incremental rollups"""
+    today = date.today()
+    first_day = today - timedelta(days=days - 1)
+    this_week = today - timedelta(days=today.weekday())
+    first_week = this_week - timedelta(weeks=weeks - 1)
+
+    try:
+        result = await db.execute(
+            select(SprintRollup).where(
+                SprintRollup.owner_id == rollup_owner(owner_id),
+                ((SprintRollup.period == "day") & (SprintRollup.period_start >= first_day))
+                | ((SprintRollup.period == "week") & (SprintRollup.period_start >= first_week))
+            )
+        )
+        rows = {(row.period, row.period_start): row for row in result.scalars()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get sprint stats: {str(e)}")
+
+    def series(period: str, starts: List[date]) -> List[SprintStatsPeriod]:
+        periods = []
+        for start in starts:
+            row = rows.get((period, start))
+            counters = {column: getattr(row, column) for column in COUNTERS} if row else {}
+            periods.append(_stats_period(start, counters))
+        return periods
+
+    day_series = series("day", [first_day + timedelta(days=i) for i in range(days)])
+    week_series = series("week", [first_week + timedelta(weeks=i) for i in range(weeks)])
+    summary = {column: sum(getattr(day, column) for day in day_series) for column in COUNTERS}
+    return SprintStats(days=day_series, weeks=week_series, summary=_stats_period(first_day, summary))
+
+
+@router.get("/sprint/stream")
+async def stream_sprint_events(request: Request, owner_id: Optional[str] = Depends(request_owner)):
+    """
+    Server-Sent Events stream of sprint activity.
+
+    Pushes sprint.started, sprint.distraction, sprint.nudge and
+    sprint.completed events as they happen, with periodic keep-alive
+    comments, so clients don't need to poll /sprint/active. Only the
+    caller's own sprints (the shared scope without a token) are streamed.
+    """
+    queue = sprint_events.subscribe(owner_id)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.sse_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.to_sse()
+        finally:
+            sprint_events.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/sprint/{sprint_id}/nudge")
-async def sprint_nudge(sprint_id: str, message: str = "15-minute nudge", db: Session = Depends(get_db_session)):
+async def sprint_nudge(
+    sprint_id: str,
+    message: str = "15-minute nudge",
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Send a mid-sprint nudge"""
     try:
-        sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
-        if not sprint:
-            raise HTTPException(status_code=404, detail="Sprint not found")
+        sprint = await _get_owned_sprint(db, sprint_id, owner_id)
         
-        return {
+        nudge = {
             "sprint_id": sprint_id,
             "nudge_time": datetime.now(),
             "message": message,
             "task": sprint.task,
             "remaining_minutes": max(0, (sprint.end_time - datetime.now()).total_seconds() / 60)
         }
+        sprint_events.publish("sprint.nudge", nudge, owner_id)
+        return nudge
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to send nudge: {str(e)}")
 
 
 @router.post("/sprint/{sprint_id}/distraction")
-async def log_distraction(sprint_id: str, distraction: str, db: Session = Depends(get_db_session)):
+async def log_distraction(
+    sprint_id: str,
+    distraction: str,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Log a distraction during sprint"""
     try:
-        sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
-        if not sprint:
-            raise HTTPException(status_code=404, detail="Sprint not found")
-        
-        # Create and save distraction
-        distraction_obj = SprintDistraction(
-            sprint_id=sprint_id,
-            distraction=distraction
-        )
+        sprint = await _get_owned_sprint(db, sprint_id, owner_id)
         
-        db.add(distraction_obj)
-        db.commit()
+        # Write-behind when enabled: the row is inserted with the next batch
+        queued = distraction_queue.enqueue(sprint_id, sprint.start_time, distraction, owner_id)
+        if queued is not None:
+            distraction_id, timestamp = queued["id"], queued["timestamp"]
+        else:
+            # Create and save distraction
+            distraction_obj = SprintDistraction(
+                sprint_id=sprint_id,
+                distraction=distraction
+            )
+            
+            db.add(distraction_obj)
+            await apply_rollup_delta(db, sprint.start_time, {"distractions": 1}, owner_id)
+            await db.commit()
+            distraction_id, timestamp = distraction_obj.id, distraction_obj.timestamp
         
-        return {
+        logged = {
             "sprint_id": sprint_id,
             "distraction": distraction,
-            "timestamp": distraction_obj.timestamp,
-            "id": distraction_obj.id
+            "timestamp": timestamp,
+            "id": distraction_id
         }
+        sprint_events.publish("sprint.distraction", logged, owner_id)
+        return logged
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to log distraction: {str(e)}")
 
 
 @router.post("/sprint/{sprint_id}/complete")
-async def complete_sprint(sprint_id: str, retro: str, db: Session = Depends(get_db_session)):
+async def complete_sprint(
+    sprint_id: str,
+    retro: str,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Complete a sprint with retrospective"""
     try:
-        sprint = db.query(Sprint).filter(Sprint.id == sprint_id).first()
-        if not sprint:
-            raise HTTPException(status_code=404, detail="Sprint not found")
+        sprint = await _get_owned_sprint(db, sprint_id, owner_id)
         
         # Update sprint status
+        before = contribution_of(sprint)
         sprint.status = "completed"
         sprint.retrospective = retro
         sprint.actual_end_time = datetime.now()
         sprint.updated_at = datetime.now()
         
-        db.commit()
+        await apply_rollup_delta(db, sprint.start_time, difference(contribution_of(sprint), before), owner_id)
+        await db.commit()
         
-        return {
+        completed = {
             "sprint_id": sprint_id,
             "completion_time": sprint.actual_end_time,
             "retrospective": retro,
             "status": "completed",
             "task": sprint.task
         }
+        sprint_events.publish("sprint.completed", completed, owner_id)
+        sprint_scheduler.cancel_sprint(sprint_id)
+        return completed
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to complete sprint: {str(e)}")
 
 
@@ -193,56 +425,179 @@ async def complete_sprint(sprint_id: str, retro: str, db: Session = Depends(get_
 async def execute_mcp_tool(request: MCPToolRequest):
     """Execute an MCP tool"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{settings.mcp_server_url}/tool",
-                json={
-                    "tool": request.tool_name,
-                    "parameters": request.parameters
-                },
-                headers={
-                    "Authorization": f"Bearer {settings.mcp_auth_token}" if settings.mcp_auth_token else ""
-                }
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"MCP tool execution failed: {response.text}"
-                )
+        return await mcp_client.call_tool(request.tool_name, request.parameters)
+    except MCPClientError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to execute MCP tool: {str(e)}")
 
 
+async def _run_batch_item(index: int, request: MCPToolRequest, semaphore: asyncio.Semaphore) -> dict:
+    """Run one batch item, capturing its error instead of failing the batch"""
+    async with semaphore:
+        try:
+            result = await mcp_client.call_tool(request.tool_name, request.parameters)
+            return {"index": index, "tool_name": request.tool_name, "ok": True, "result": result}
+        except MCPClientError as e:
+            error = {"status_code": e.status_code, "detail": e.detail}
+        except Exception as e:
+            error = {"status_code": 500, "detail": f"Failed to execute MCP tool: {str(e)}"}
+        return {"index": index, "tool_name": request.tool_name, "ok": False, "error": error}
+
+
+@router.post("/mcp/batch")
+async def execute_mcp_batch(batch: MCPBatchRequest):
+    """
+    Execute several MCP tools concurrently.
+
+    Items run with at most `max_parallel` in flight and fail independently.
+    With `stream: true` the response is NDJSON, one line per item in
+    completion order, so fast tools are not held back by the slowest one.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one request")
+    if len(batch.requests) > settings.mcp_batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch exceeds the limit of {settings.mcp_batch_max_items} requests"
+        )
+
+    parallel = min(batch.max_parallel or settings.mcp_batch_max_parallel, settings.mcp_batch_max_parallel)
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    tasks = [
+        asyncio.create_task(_run_batch_item(index, request, semaphore))
+        for index, request in enumerate(batch.requests)
+    ]
+
+    if batch.stream:
+        async def stream_results():
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    yield json.dumps(await finished, default=str) + "\n"
+            finally:
+                # Client went away: don't keep calling the MCP server for it
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*tasks)
+    succeeded = sum(1 for item in results if item["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+
+@router.get("/distractions/queue")
+async def get_distraction_queue_stats():
+    """Write-behind distraction queue depth and flush statistics"""
+    return distraction_queue.stats()
+
+
+@router.get("/mcp/stats")
+async def get_mcp_stats():
+    """MCP client pool, concurrency and circuit breaker statistics"""
+    return mcp_client.stats()
+
+
+async def _ritual_response(name: str, owner_id: Optional[str], request: Request, db: AsyncSession):
+    """
+    Serve a ritual checklist from the cache, loading it from the database
+    on a miss. Users get their own ritual when they have one, otherwise
+    the shared default.
+    """
+    key = (owner_id, name)
+    cached = ritual_cache.get(key)
+    if cached is None:
+        version = ritual_cache.version
+        scope = Ritual.owner_id.is_(None)
+        if owner_id is not None:
+            scope = (Ritual.owner_id == owner_id) | scope
+        # Single query: ritual JOIN steps, ordered by RitualStep.order, with
+        # the user's own ritual ahead of the shared one
+        result = await db.execute(
+            select(Ritual)
+            .options(joinedload(Ritual.steps))
+            .filter(scope, Ritual.name == name, Ritual.is_active == True)  # noqa: E712
+            .order_by(Ritual.owner_id.is_(None))
+        )
+        ritual = result.unique().scalars().first()
+        if not ritual:
+            raise HTTPException(status_code=404, detail=f"Ritual '{name}' not found")
+
+        body = json.dumps({
+            "ritual": ritual.title,
+            "steps": [step.step_text for step in ritual.steps],
+            "estimated_duration": f"{ritual.estimated_duration_minutes} minutes"
+        }).encode()
+        cached = (body, make_etag(body))
+        ritual_cache.put(key, version, *cached)
+
+    body, etag = cached
+    return conditional_response(request, body, etag)
+
+
 @router.get("/rituals/morning")
-async def get_morning_ritual():
+async def get_morning_ritual(
+    request: Request,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get morning ritual checklist"""
-    return {
-        "ritual": "Morning Ritual",
-        "steps": [
-            "Cold shower",
-            "Put on Limitless AI pendant",
-            "Quick project/meeting review",
-            "Journaling (gratitude + focus + visualization/affirmation)"
-        ],
-        "estimated_duration": "20 minutes"
-    }
+    return await _ritual_response("morning", owner_id, request, db)
 
 
 @router.get("/rituals/evening")
-async def get_evening_ritual():
+async def get_evening_ritual(
+    request: Request,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get evening ritual checklist"""
-    return {
-        "ritual": "Evening Ritual",
-        "steps": [
-            "Charge all devices (including pendant)",
-            "Retro journaling (3 wins + 1 lesson + tomorrow's focus)",
-            "Looking ahead: pick tomorrow's focus"
-        ],
-        "estimated_duration": "15 minutes"
-    }
+    return await _ritual_response("evening", owner_id, request, db)
+
+
+@router.get("/reports/heatmap")
+async def get_focus_heatmap(
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Focus minutes by weekday and hour of day"""
+    # Imported on first use: NumPy is only needed by the report endpoints
+    from core.sprint_reports import load_sprint_columns, focus_heatmap
+
+    sprints = await load_sprint_columns(db, since, until, owner_id)
+    return await asyncio.to_thread(focus_heatmap, sprints)
+
+
+@router.get("/reports/trends")
+async def get_productivity_trend(
+    window_days: int = Query(30, ge=1, le=365),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Daily focus with rolling totals and completion rate"""
+    from core.sprint_reports import load_sprint_columns, productivity_trend
+
+    sprints = await load_sprint_columns(db, since, until, owner_id)
+    return await asyncio.to_thread(productivity_trend, sprints, window_days)
+
+
+@router.get("/reports/distractions")
+async def get_distraction_profile(
+    bin_minutes: int = Query(5, ge=1, le=120),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """How far into a sprint distractions happen"""
+    from core.sprint_reports import load_distraction_columns, distraction_profile
+
+    distractions = await load_distraction_columns(db, since, until, owner_id)
+    return await asyncio.to_thread(distraction_profile, distractions, bin_minutes)
 
 
 @router.get("/family/reminders")
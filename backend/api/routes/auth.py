@@ -1,19 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import jwt
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.config import settings
+from core.database import get_async_db
+from core.auth import AuthenticatedUser, PasswordHasherOverloaded, current_user, password_hasher
+from models import User as UserModel
 
 router = APIRouter()
 
-# OAuth2 scheme for token authentication
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Checked when the username is unknown, so a failed login costs one bcrypt
+# verification either way and response times don't reveal which usernames exist
+DUMMY_PASSWORD_HASH = "$2b$12$e4OyrCpXtcw7oaWP07l1euTJhU9DdCBc4lXOkBPo3FOCdbfxpUMu6"
 
 
 class UserCreate(BaseModel):
@@ -38,14 +40,20 @@ class User(BaseModel):
     is_active: bool = True
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash (bcrypt runs off the event loop)"""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Hash a password (bcrypt runs off the event loop)"""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -61,43 +69,61 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 @router.post("/register", response_model=User)
-async def register_user(user: UserCreate):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
-    # In a real app, you'd check if user exists and save to database
-    # For now, just return the user data
-    return User(
-        username=user.username,
-        email=user.email
+    username, email = user.username.strip(), user.email.strip().lower()
+    if not username or not email or not user.password:
+        raise HTTPException(status_code=400, detail="Username, email and password are required")
+
+    # Both lookups are unique-index seeks; the unique constraints still
+    # decide races between concurrent registrations
+    result = await db.execute(
+        select(UserModel.username, UserModel.email)
+        .where((UserModel.username == username) | (UserModel.email == email))
     )
+    if result.first() is not None:
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+
+    db_user = UserModel(username=username, email=email, hashed_password=await get_password_hash(user.password))
+    db.add(db_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+    return User(username=db_user.username, email=db_user.email, is_active=db_user.is_active)
 
 
 @router.post("/login", response_model=Token)
-async def login_user(user_credentials: UserLogin):
+async def login_user(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user and return access token"""
-    # In a real app, you'd verify against database
-    # For now, just create a token
+    result = await db.execute(select(UserModel).where(UserModel.username == user_credentials.username.strip()))
+    db_user = result.scalars().first()
+    password_ok = await verify_password(
+        user_credentials.password, db_user.hashed_password if db_user else DUMMY_PASSWORD_HASH
+    )
+    if db_user is None or not password_ok or not db_user.is_active:
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user_credentials.username}, expires_delta=access_token_expires
+        data={"sub": db_user.username, "uid": db_user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=User)
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(user: AuthenticatedUser = Depends(current_user), db: AsyncSession = Depends(get_async_db)):
     """Get current user information"""
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    # In a real app, you'd get user from database
-    return User(username=username, email=f"{username}@example.com")
+    db_user = await db.get(UserModel, user.user_id)
+    if db_user is None or not db_user.is_active:
+        raise HTTPException(
+            status_code=401,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return User(username=db_user.username, email=db_user.email, is_active=db_user.is_active)
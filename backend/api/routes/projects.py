@@ -1,10 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+import json
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.project import Project as ProjectModel
-from core.database import get_db
+from core.config import settings
+from core.database import get_async_db, AsyncSessionLocal
+from core.auth import request_owner, owned_by
+from core.pagination import encode_cursor, decode_cursor, keyset_condition
+from core.fast_json import FastJSONResponse, rows_to_dicts
+from core.http_cache import not_modified
+from core.collection_versions import collection_versions
 
 router = APIRouter()
 
@@ -21,6 +31,9 @@ class Project(BaseModel):
     is_completed: bool
     created_at: datetime
     updated_at: datetime
+    due_date: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    notes: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -42,26 +55,310 @@ class ProjectUpdate(BaseModel):
     progress_percentage: Optional[int] = None
 
 
-@router.get("/", response_model=List[Project])
-async def get_projects(db: Session = Depends(get_db)):
-    """Get all projects"""
-    projects = db.query(ProjectModel).all()
-    return projects
+class ProjectImport(BaseModel):
+    """One NDJSON line of a bulk import; rows with a known id are updated"""
+    id: Optional[str] = None
+    title: str
+    description: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    category: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    progress_percentage: Optional[int] = None
+    notes: Optional[str] = None
+    is_high_priority: Optional[bool] = None
+    is_completed: Optional[bool] = None
 
 
-@router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: str, db: Session = Depends(get_db)):
-    """Get a specific project by ID"""
-    project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
-    if not project:
+MAX_REPORTED_ERRORS = 100
+# Page size when a cursor is passed without a limit
+DEFAULT_PAGE_SIZE = 200
+
+# Sort keys accepted by GET /api/projects/ (prefix with "-" for descending).
+# Nullable columns such as due_date are excluded: keyset seeks can't step
+# over NULLs.
+SORT_KEYS = {
+    "created_at": ProjectModel.created_at,
+    "updated_at": ProjectModel.updated_at,
+    "title": ProjectModel.title,
+    "progress_percentage": ProjectModel.progress_percentage,
+}
+PROJECT_FIELDS = set(Project.model_fields)
+# Columns with a default; an explicit null in an import means "not given"
+# for these rather than writing NULL
+DEFAULTED_COLUMNS = {column.name for column in ProjectModel.__table__.columns if column.default is not None}
+
+
+def _split(value: Optional[str]) -> List[str]:
+    """Comma-separated query value -> list of lower-cased items"""
+    return [item.strip().lower() for item in value.split(",") if item.strip()] if value else []
+
+
+def _upsert_statement(dialect_name: str, columns: List[str]):
+    """INSERT ... ON CONFLICT(id) DO UPDATE for the given columns, only of rows with the same owner"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(ProjectModel.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={column: stmt.excluded[column] for column in columns if column not in ("id", "created_at", "owner_id")},
+        where=ProjectModel.__table__.c.owner_id.is_not_distinct_from(stmt.excluded.owner_id)
+    )
+
+
+async def _flush_import_batch(db: AsyncSession, rows: List[dict], owner_id: Optional[str]) -> List[str]:
+    """
+    Upsert one batch in a single transaction, one executemany per column
+    set. Returns the ids that were skipped because they belong to another
+    owner.
+    """
+    result = await db.execute(
+        select(ProjectModel.id).where(
+            ProjectModel.id.in_([row["id"] for row in rows]),
+            ProjectModel.owner_id.is_distinct_from(owner_id)
+        )
+    )
+    foreign = set(result.scalars())
+    groups = {}
+    for row in rows:
+        if row["id"] not in foreign:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+    dialect_name = db.bind.dialect.name
+    for columns, group in groups.items():
+        await db.execute(_upsert_statement(dialect_name, list(columns)), group)
+    await db.commit()
+    return sorted(foreign)
+
+
+async def _get_owned_project(db: AsyncSession, project_id: str, owner_id: Optional[str]) -> ProjectModel:
+    """The project, or a 404 if it doesn't exist in the caller's scope"""
+    project = await db.get(ProjectModel, project_id)
+    if not project or project.owner_id != owner_id:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
+@router.get("/", response_model=None)
+async def get_projects(
+    request: Request,
+    status: Optional[str] = Query(None, description="Comma-separated statuses"),
+    priority: Optional[str] = Query(None, description="Comma-separated priorities"),
+    category: Optional[str] = None,
+    is_high_priority: Optional[bool] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    sort: str = Query("created_at", description="Sort key, prefix with '-' for descending"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get projects, with combinable filters, sorting, field projection and
+    keyset pagination.
+
+    The body stays a plain list for existing clients, and without a limit
+    or cursor it holds every matching project. Paged requests get the
+    cursor for the next page, when more rows are available, in the
+    X-Next-Cursor header (and a Link rel="next" header). Responses carry
+    a collection ETag; If-None-Match with the current one gets a 304.
+    """
+    etag = collection_versions.etag("projects", owner_id, request.url.query)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    sort_name = sort.lstrip("-")
+    descending = sort.startswith("-")
+    if sort_name not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key '{sort_name}'")
+    selected = _split(fields)
+    unknown = set(selected) - PROJECT_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    sort_column = SORT_KEYS[sort_name]
+    # Only the requested columns (plus the sort key for the cursor), as tuples
+    output = [name for name in Project.model_fields if not selected or name in selected or name == "id"]
+    columns = output if sort_name in output else output + [sort_name]
+    table = ProjectModel.__table__
+    query = select(*(table.c[name] for name in columns)).filter(owned_by(ProjectModel.owner_id, owner_id))
+    statuses, priorities = _split(status), _split(priority)
+    if statuses:
+        query = query.filter(ProjectModel.status.in_(statuses))
+    if priorities:
+        query = query.filter(ProjectModel.priority.in_(priorities))
+    if category is not None:
+        query = query.filter(ProjectModel.category == category)
+    if is_high_priority is not None:
+        query = query.filter(ProjectModel.is_high_priority == is_high_priority)
+    if due_after is not None:
+        query = query.filter(ProjectModel.due_date >= due_after)
+    if due_before is not None:
+        query = query.filter(ProjectModel.due_date < due_before)
+
+    if cursor:
+        try:
+            cursor_sort, *after = decode_cursor(cursor, 3)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if cursor_sort != sort:
+            raise HTTPException(status_code=400, detail="Cursor was issued for a different sort")
+        query = query.filter(keyset_condition((sort_column, ProjectModel.id), after, (descending, descending)))
+
+    order = (sort_column.desc(), ProjectModel.id.desc()) if descending else (sort_column, ProjectModel.id)
+    query = query.order_by(*order)
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor([sort, last[sort_name], last["id"]])
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<?cursor={next_cursor}>; rel="next"'
+
+    return FastJSONResponse(rows_to_dicts(output, rows), headers=headers)
+
+
+@router.get("/export")
+async def export_projects(owner_id: Optional[str] = Depends(request_owner)):
+    """Stream every project as NDJSON using a server-side cursor"""
+    async def rows():
+        # Own session: the generator outlives the request dependency scope
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(ProjectModel.__table__)
+                .where(owned_by(ProjectModel.owner_id, owner_id))
+                .execution_options(yield_per=settings.project_bulk_batch_size)
+            )
+            async for partition in result.partitions():
+                yield "".join(
+                    json.dumps(dict(row._mapping), default=lambda value: value.isoformat()) + "\n"
+                    for row in partition
+                )
+
+    return StreamingResponse(
+        rows(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'}
+    )
+
+
+@router.post("/bulk")
+async def bulk_import_projects(
+    request: Request,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upsert projects from a streamed NDJSON body (one project per line).
+
+    Lines are parsed as they arrive and written in batched transactions,
+    so large imports never sit in memory at once. Rows whose id already
+    exists are updated with the fields they provide (null for a field
+    with a default, such as progress_percentage, counts as not provided);
+    invalid lines, and ids that belong to another owner, are skipped and
+    reported.
+    """
+    batch_size = settings.project_bulk_batch_size
+    batch: List[dict] = []
+    batch_lines = {}
+    errors = []
+    received = upserted = batches = 0
+    buffer = b""
+    line_number = 0
+
+    async def handle_line(raw: bytes):
+        nonlocal received
+        if not raw.strip():
+            return
+        received += 1
+        try:
+            item = ProjectImport.model_validate_json(raw)
+        except ValidationError as e:
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_number, "error": e.errors(include_url=False)})
+            return
+        row = {
+            name: value for name, value in item.model_dump(exclude_unset=True).items()
+            if value is not None or name not in DEFAULTED_COLUMNS
+        }
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("updated_at", datetime.utcnow())
+        row["owner_id"] = owner_id
+        batch.append(row)
+        batch_lines[row["id"]] = line_number
+
+    async def flush():
+        nonlocal upserted, batches
+        if batch:
+            skipped = await _flush_import_batch(db, batch, owner_id)
+            for project_id in skipped:
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": batch_lines[project_id], "error": f"Project id '{project_id}' already exists"})
+            upserted += len(batch) - len(skipped)
+            batches += 1
+            batch.clear()
+            batch_lines.clear()
+
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                await handle_line(line)
+                if len(batch) >= batch_size:
+                    await flush()
+        line_number += 1
+        await handle_line(buffer)
+        await flush()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Bulk import failed after {upserted} projects: {str(e)}"
+        )
+
+    return {
+        "received": received,
+        "upserted": upserted,
+        "batches": batches,
+        "failed": received - upserted,
+        "errors": errors
+    }
+
+
+@router.get("/{project_id}", response_model=Project)
+async def get_project(
+    project_id: str,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific project by ID"""
+    return await _get_owned_project(db, project_id, owner_id)
+
+
 @router.post("/", response_model=Project)
-async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(
+    project: ProjectCreate,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Create a new project"""
     db_project = ProjectModel(
+        owner_id=owner_id,
         title=project.title,
         description=project.description,
         priority=project.priority,
@@ -69,17 +366,20 @@ async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
         status="active"
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 
 @router.put("/{project_id}", response_model=Project)
-async def update_project(project_id: str, project_update: ProjectUpdate, db: Session = Depends(get_db)):
+async def update_project(
+    project_id: str,
+    project_update: ProjectUpdate,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Update an existing project"""
-    project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_owned_project(db, project_id, owner_id)
     
     # Update only provided fields
     update_data = project_update.dict(exclude_unset=True)
@@ -87,33 +387,49 @@ async def update_project(project_id: str, project_update: ProjectUpdate, db: Ses
         setattr(project, field, value)
     
     project.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str, db: Session = Depends(get_db)):
+async def delete_project(
+    project_id: str,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Delete a project"""
-    project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await _get_owned_project(db, project_id, owner_id)
     
     project_title = project.title
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
     return {"message": f"Project '{project_title}' deleted successfully"}
 
 
 @router.get("/priority/{priority}")
-async def get_projects_by_priority(priority: str, db: Session = Depends(get_db)):
+async def get_projects_by_priority(
+    priority: str,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get projects filtered by priority"""
-    projects = db.query(ProjectModel).filter(ProjectModel.priority == priority.lower()).all()
-    return projects
+    result = await db.execute(
+        select(ProjectModel)
+        .filter(owned_by(ProjectModel.owner_id, owner_id), ProjectModel.priority == priority.lower())
+    )
+    return result.scalars().all()
 
 
 @router.get("/status/{status}")
-async def get_projects_by_status(status: str, db: Session = Depends(get_db)):
+async def get_projects_by_status(
+    status: str,
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get projects filtered by status"""
-    projects = db.query(ProjectModel).filter(ProjectModel.status == status.lower()).all()
-    return projects
+    result = await db.execute(
+        select(ProjectModel)
+        .filter(owned_by(ProjectModel.owner_id, owner_id), ProjectModel.status == status.lower())
+    )
+    return result.scalars().all()
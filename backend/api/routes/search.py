@@ -0,0 +1,137 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+import re
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_async_db
+from core.auth import request_owner
+
+router = APIRouter()
+
+KINDS = {"project", "sprint", "distraction"}
+# Where each kind's owner lives: (table, index column holding that table's id)
+OWNER_SOURCES = {
+    "project": ("projects", "ref_id"),
+    "sprint": ("sprints", "ref_id"),
+    "distraction": ("sprints", "parent_id"),
+}
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+STOP_WORDS = {
+    "a", "an", "and", "are", "did", "do", "for", "i", "in", "is", "it", "me", "my",
+    "of", "on", "or", "the", "to", "was", "what", "when", "where", "which", "who", "with",
+}
+
+
+class SearchResult(BaseModel):
+    kind: str
+    id: str
+    sprint_id: Optional[str] = None
+    title: str
+    snippet: str
+    occurred_at: Optional[datetime] = None
+    score: Optional[float] = None  # relevance sort only
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+
+
+def _match_expression(q: str, mode: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every token is quoted so user
+    punctuation can't break the syntax, the last token is a prefix match,
+    and common question words are dropped.
+    """
+    tokens = [token for token in TOKEN_RE.findall(q.lower())]
+    meaningful = [token for token in tokens if token not in STOP_WORDS] or tokens
+    if not meaningful:
+        return None
+    terms = [f'"{token}"' for token in meaningful[:-1]] + [f'"{meaningful[-1]}"*']
+    return (" OR " if mode == "any" else " AND ").join(terms)
+
+
+def _kind_query(kind: str, sort: str) -> str:
+    """
+    Top matches from one kind's index. Doc ids grow with every write, so
+    "recent" walks the index backwards and stops after one page.
+    Relevance orders by the FTS5 rank column, so bm25 is computed inside
+    FTS5 for every match and only the top rows are handed back. Matches
+    are limited to the caller's scope by a primary key probe of the
+    owning row.
+    """
+    table = f"search_{kind}"
+    source, source_id = OWNER_SOURCES[kind]
+    owned = f"EXISTS (SELECT 1 FROM {source} WHERE {source}.id = {table}.{source_id} AND {source}.owner_id IS :owner)"
+    columns = (
+        f"'{kind}' AS kind, rowid AS doc_id, ref_id, parent_id, occurred_at, title, "
+        f"snippet({table}, -1, '[', ']', '…', 12) AS snippet"
+    )
+    if sort == "recent":
+        return f"""
+            SELECT {columns}, NULL AS score FROM {table}
+            WHERE {table} MATCH :match AND {owned} ORDER BY rowid DESC LIMIT :limit
+        """
+    # bm25 weights follow column order: ref_id, parent_id, occurred_at, title, body
+    return f"""
+        SELECT {columns}, rank AS score FROM {table}
+        WHERE {table} MATCH :match AND rank MATCH 'bm25(0.0, 0.0, 0.0, 5.0, 1.0)' AND {owned}
+        ORDER BY rank LIMIT :limit
+    """
+
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kinds: Optional[str] = Query(None, description="Comma-separated: project, sprint, distraction"),
+    mode: str = Query("any", pattern="^(any|all)$", description="Match any or all terms"),
+    sort: str = Query("relevance", pattern="^(relevance|recent)$"),
+    limit: int = Query(20, ge=1, le=100),
+    owner_id: Optional[str] = Depends(request_owner),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search across projects, sprints, retrospectives and distractions"""
+    selected = [kind.strip() for kind in kinds.split(",") if kind.strip()] if kinds else sorted(KINDS)
+    unknown = set(selected) - KINDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+    match = _match_expression(q, mode)
+    if match is None:
+        return SearchResponse(query=q, results=[])
+
+    # One index per kind, merged: each contributes at most one page
+    parts = " UNION ALL ".join(f"SELECT * FROM ({_kind_query(kind, sort)})" for kind in sorted(set(selected)))
+    order = "score" if sort == "relevance" else "doc_id DESC"
+    statement = text(f"SELECT * FROM ({parts}) ORDER BY {order} LIMIT :limit")
+    params = {
+        "match": match,
+        "limit": limit,
+        "owner": owner_id,
+    }
+
+    try:
+        result = await db.execute(statement, params)
+    except OperationalError as e:
+        if "no such table" in str(e) or "no such module" in str(e):
+            raise HTTPException(status_code=503, detail="Search index is not available on this database")
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {str(e.orig)}")
+
+    return SearchResponse(
+        query=q,
+        results=[
+            SearchResult(
+                kind=row.kind,
+                id=row.ref_id,
+                sprint_id=row.parent_id,
+                title=row.title,
+                snippet=row.snippet,
+                occurred_at=row.occurred_at,
+                score=-row.score if row.score is not None else None
+            )
+            for row in result
+        ]
+    )
@@ -0,0 +1,36 @@
+"""
+Shared helpers for the benchmark scripts
+
+Benchmarks run against a throwaway SQLite file so they never touch the
+local ai_assistant.db. Import this module (and call use_temp_database)
+before importing anything from core/ or main.
+"""
+
+import os
+import sys
+import tempfile
+
+# Make the backend package importable when run as `python benchmarks/x.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def use_temp_database(name: str = "benchmark.db") -> str:
+    """Point the app at a fresh SQLite file and return its path"""
+    path = os.path.join(tempfile.mkdtemp(prefix="assistant-bench-"), name)
+    # Only production mode honours DATABASE_URL, see core/config.py
+    os.environ["ENVIRONMENT"] = "production"
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}ms"
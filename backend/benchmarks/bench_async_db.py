@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: /health latency while sprint writes are hammered
+
+Measures /health latency on an idle app, then again while many concurrent
+clients start sprints and log distractions. With the async database layer
+the p99 of /health should stay roughly flat because SQLite writes no
+longer block the event loop.
+
+Usage:
+    python benchmarks/bench_async_db.py [--writers 20] [--writes 25]
+"""
+
+import argparse
+import asyncio
+import time
+
+from _common import use_temp_database, percentile, format_ms
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+from core.database import init_db, async_engine  # noqa: E402
+
+
+async def probe_health(client: httpx.AsyncClient, samples: list, stop: asyncio.Event, interval: float):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/health")
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200
+        await asyncio.sleep(interval)
+
+
+async def hammer_sprints(client: httpx.AsyncClient, writes: int, errors: list):
+    for i in range(writes):
+        response = await client.post(
+            "/api/assistant/sprint/start",
+            json={"task": f"Benchmark sprint {i}", "duration_minutes": 25}
+        )
+        if response.status_code != 200:
+            errors.append(response.status_code)
+            continue
+        sprint_id = response.json()["id"]
+        response = await client.post(
+            f"/api/assistant/sprint/{sprint_id}/distraction",
+            params={"distraction": "checked phone"}
+        )
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def measure(client, writers: int, writes: int, interval: float):
+    samples, errors = [], []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe_health(client, samples, stop, interval))
+    started = time.perf_counter()
+    if writers:
+        await asyncio.gather(*(hammer_sprints(client, writes, errors) for _ in range(writers)))
+    else:
+        await asyncio.sleep(writes * 0.02)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+    return samples, errors, elapsed
+
+
+async def main(writers: int, writes: int, interval: float):
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/health")  # warm up routing and logging
+        idle, _, _ = await measure(client, 0, writes, interval)
+        loaded, errors, elapsed = await measure(client, writers, writes, interval)
+    await async_engine.dispose()
+
+    total_writes = writers * writes * 2
+    print(f"{'phase':<8} {'samples':>8} {'p50':>10} {'p99':>10} {'max':>10}")
+    for phase, samples in (("idle", idle), ("loaded", loaded)):
+        print(
+            f"{phase:<8} {len(samples):>8} {format_ms(percentile(samples, 50)):>10} "
+            f"{format_ms(percentile(samples, 99)):>10} {format_ms(max(samples)):>10}"
+        )
+    print(f"writes: {total_writes} in {elapsed:.2f}s ({total_writes / elapsed:.0f}/s), errors: {len(errors)}")
+    ratio = percentile(loaded, 99) / max(percentile(idle, 99), 1e-9)
+    print(f"/health p99 loaded/idle ratio: {ratio:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=20, help="concurrent writer clients")
+    parser.add_argument("--writes", type=int, default=25, help="sprints started per writer")
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between /health probes")
+    args = parser.parse_args()
+    asyncio.run(main(args.writers, args.writes, args.interval))
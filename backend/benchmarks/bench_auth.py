@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Login storm load test and token verification cache
+
+While a burst of concurrent logins runs bcrypt, a probe keeps calling an
+unrelated endpoint and records its latency. The storm is run twice:
+against a bench-only handler that calls bcrypt inline (the old
+behaviour, which blocks the event loop) and against the real
+POST /api/auth/login, which verifies on the bcrypt thread pool. A second
+section times /api/auth/me with the verified claims cache on and off.
+
+Usage:
+    python benchmarks/bench_auth.py [--logins 8]
+"""
+
+import argparse
+import asyncio
+import time
+
+from _common import use_temp_database, percentile, format_ms
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+from main import app  # noqa: E402
+from core.auth import password_hasher, token_claims_cache  # noqa: E402
+from core.database import init_db  # noqa: E402
+
+USERNAME = "bench"
+PASSWORD = "correct horse battery staple"
+STORED_HASH = password_hasher.hash_sync(PASSWORD)
+PROBE_PATH = "/health"
+
+
+class Credentials(BaseModel):
+    username: str
+    password: str
+
+
+@app.post("/bench/login-inline")
+async def login_inline(credentials: Credentials):
+    if not password_hasher.verify_sync(credentials.password, STORED_HASH):
+        raise HTTPException(status_code=401)
+    return {"ok": True}
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, samples: list, interval: float = 0.01):
+    """Probe on a fixed schedule; latency counts from when each probe was due,
+    so time spent with the event loop blocked shows up instead of hiding"""
+    due = time.perf_counter()
+    while True:
+        await client.get(PROBE_PATH)
+        finished = time.perf_counter()
+        while due <= finished:
+            samples.append(finished - due)
+            due += interval
+        if stop.is_set():
+            break
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+
+async def storm(client: httpx.AsyncClient, path: str, logins: int):
+    stop = asyncio.Event()
+    samples = []
+    prober = asyncio.create_task(probe(client, stop, samples))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    responses = await asyncio.gather(*[
+        client.post(path, json={"username": USERNAME, "password": PASSWORD}) for _ in range(logins)
+    ])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+    assert all(response.status_code == 200 for response in responses), [r.status_code for r in responses]
+    return samples, elapsed
+
+
+async def time_me(client: httpx.AsyncClient, token: str, repeats: int, cached: bool) -> list:
+    headers = {"Authorization": f"Bearer {token}"}
+    samples = []
+    for _ in range(repeats):
+        if not cached:
+            token_claims_cache.clear()
+        begun = time.perf_counter()
+        response = await client.get("/api/auth/me", headers=headers)
+        samples.append(time.perf_counter() - begun)
+        assert response.status_code == 200, response.text
+    return samples
+
+
+async def main(logins: int):
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        response = await client.post(
+            "/api/auth/register", json={"username": USERNAME, "email": "bench@example.com", "password": PASSWORD}
+        )
+        assert response.status_code == 200, response.text
+
+        idle_stop = asyncio.Event()
+        idle = []
+        prober = asyncio.create_task(probe(client, idle_stop, idle))
+        await asyncio.sleep(1.0)
+        idle_stop.set()
+        await prober
+
+        print(f"{logins} concurrent logins (bcrypt {password_hasher.rounds} rounds, "
+              f"pool of {password_hasher.max_concurrency}); probe: GET {PROBE_PATH}\n")
+        print(f"{'scenario':<24} {'storm':>8} {'probes':>7} {'probe p50':>10} {'probe p99':>10} {'probe max':>10}")
+        print(f"{'idle':<24} {'':>8} {len(idle):>7} {format_ms(percentile(idle, 50)):>10} "
+              f"{format_ms(percentile(idle, 99)):>10} {format_ms(max(idle)):>10}")
+        for label, path in [("bcrypt inline (before)", "/bench/login-inline"), ("/api/auth/login (pool)", "/api/auth/login")]:
+            samples, elapsed = await storm(client, path, logins)
+            print(f"{label:<24} {elapsed:>7.1f}s {len(samples):>7} {format_ms(percentile(samples, 50)):>10} "
+                  f"{format_ms(percentile(samples, 99)):>10} {format_ms(max(samples)):>10}")
+
+        response = await client.post("/api/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        token = response.json()["access_token"]
+        print(f"\n{'GET /api/auth/me':<24} {'p50':>10} {'p99':>10}")
+        for label, cached in [("claims cache off", False), ("claims cache on", True)]:
+            samples = await time_me(client, token, 2000, cached)
+            print(f"{label:<24} {format_ms(percentile(samples, 50)):>10} {format_ms(percentile(samples, 99)):>10}")
+        print(f"\nhasher {password_hasher.stats()}\ncache {token_claims_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins))
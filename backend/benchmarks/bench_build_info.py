@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: process spawns and latency of the build-info endpoints
+
+Hits /, /debug/cors and /test/cors repeatedly while counting calls to
+subprocess.Popen and os.popen, and compares against the per-request cost
+of the old `git rev-parse` fork.
+
+Usage:
+    python benchmarks/bench_build_info.py [--requests 500]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import time
+
+from _common import use_temp_database, format_ms
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+
+ENDPOINTS = ["/", "/debug/cors", "/test/cors"]
+
+
+class SpawnCounter:
+    """Count process spawns by wrapping subprocess.Popen and os.popen"""
+
+    def __init__(self):
+        self.count = 0
+        self._popen_init = subprocess.Popen.__init__
+        self._os_popen = os.popen
+
+    def __enter__(self):
+        counter = self
+        original_init = self._popen_init
+        original_os_popen = self._os_popen
+
+        def counting_init(popen_self, *args, **kwargs):
+            counter.count += 1
+            return original_init(popen_self, *args, **kwargs)
+
+        def counting_os_popen(*args, **kwargs):
+            counter.count += 1
+            return original_os_popen(*args, **kwargs)
+
+        subprocess.Popen.__init__ = counting_init
+        os.popen = counting_os_popen
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.Popen.__init__ = self._popen_init
+        os.popen = self._os_popen
+
+
+async def main(requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in ENDPOINTS:
+            await client.get(endpoint)  # warm up
+        print(f"{'endpoint':<14} {'avg':>10} {'spawns':>8}")
+        total_spawns = 0
+        for endpoint in ENDPOINTS:
+            with SpawnCounter() as spawns:
+                started = time.perf_counter()
+                for _ in range(requests):
+                    response = await client.get(endpoint)
+                    assert response.status_code == 200
+                elapsed = time.perf_counter() - started
+            total_spawns += spawns.count
+            print(f"{endpoint:<14} {format_ms(elapsed / requests):>10} {spawns.count:>8}")
+
+    started = time.perf_counter()
+    for _ in range(50):
+        try:
+            subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL)
+        except Exception:
+            pass
+    print(f"\nold per-request cost of one git fork: {format_ms((time.perf_counter() - started) / 50)}")
+    if total_spawns:
+        raise SystemExit(f"endpoints spawned {total_spawns} processes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Bytes on the wire for the dashboard's list refetches
+
+App.tsx and ProjectDashboard.tsx load GET /api/projects/ on mount and
+again after every edit; the sprint list is reloaded the same way. This
+replays that pattern in-process against a database of N projects and N
+sprints: R refetches of each list, with an edit (PUT a project, start a
+sprint) before every E-th one. Each client strategy is replayed on the
+same sequence:
+
+- identity: no compression, no conditional requests
+- gzip: Accept-Encoding: gzip
+- br: Accept-Encoding: br (skipped if the 'brotli' package is missing)
+- gzip + etag: gzip, and If-None-Match with the last ETag, as a browser
+  does for a `no-cache` response
+
+Bytes are the raw response body plus status line and headers.
+
+Usage:
+    python benchmarks/bench_conditional_get.py [--rows 200,1000] [--refetches 50] [--edit-every 5]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from _common import use_temp_database
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+from main import app  # noqa: E402
+from core.compression import brotli  # noqa: E402
+from core.database import engine, init_db  # noqa: E402
+from models import Project, Sprint, SprintDistraction  # noqa: E402
+
+
+def fill(rows: int) -> str:
+    """Replace all projects and sprints with `rows` of each; returns a project id to edit"""
+    base = datetime(2024, 1, 1)
+    projects, sprints, distractions = [], [], []
+    for number in range(rows):
+        created = base + timedelta(minutes=number)
+        projects.append({
+            "id": str(uuid.uuid4()), "title": f"Project {number}", "description": f"Benchmark project number {number}",
+            "priority": ("low", "medium", "high")[number % 3], "status": "active", "category": "bench",
+            "progress_percentage": number % 101, "is_high_priority": number % 7 == 0, "is_completed": False,
+            "created_at": created, "updated_at": created,
+        })
+        sprint_id = str(uuid.uuid4())
+        sprints.append({
+            "id": sprint_id, "task": f"Sprint {number}", "duration_minutes": 25, "status": "completed",
+            "start_time": created, "end_time": created + timedelta(minutes=25), "created_at": created,
+            "updated_at": created,
+        })
+        distractions.append({"id": str(uuid.uuid4()), "sprint_id": sprint_id, "distraction": "phone", "timestamp": created})
+    with engine.begin() as connection:
+        for model in (SprintDistraction, Sprint, Project):
+            connection.execute(delete(model))
+        connection.execute(insert(Project), projects)
+        connection.execute(insert(Sprint), sprints)
+        connection.execute(insert(SprintDistraction), distractions)
+    return projects[0]["id"]
+
+
+def wire_bytes(response: httpx.Response) -> int:
+    head = len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n")
+    head += sum(len(name) + len(value) + 4 for name, value in response.headers.raw) + 2
+    return head + response.num_bytes_downloaded
+
+
+async def replay(client, path: str, edit, refetches: int, edit_every: int, encoding: str, conditional: bool) -> dict:
+    total = not_modified = 0
+    etag = None
+    elapsed = 0.0
+    for number in range(refetches):
+        if number and number % edit_every == 0:
+            await edit(client, number)
+        headers = {"Accept-Encoding": encoding}
+        if conditional and etag:
+            headers["If-None-Match"] = etag
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        elapsed += time.perf_counter() - started
+        assert response.status_code in (200, 304), response.text
+        not_modified += response.status_code == 304
+        etag = response.headers.get("etag", etag)
+        total += wire_bytes(response)
+    return {"bytes": total, "not_modified": not_modified, "ms": elapsed * 1000 / refetches}
+
+
+async def main(row_counts: list, refetches: int, edit_every: int):
+    await init_db()
+    strategies = [("identity", "identity", False), ("gzip", "gzip", False)]
+    if brotli is not None:
+        strategies.append(("br", "br", False))
+    strategies.append(("gzip + etag", "gzip", True))
+    if brotli is None:
+        print("'brotli' is not installed; skipping br\n")
+
+    print(f"{refetches} refetches per list, an edit before every {edit_every}th\n")
+    print(f"{'endpoint':<30} {'rows':>6} {'strategy':<12} {'total KB':>9} {'per fetch':>10} {'saved':>7} {'304s':>5} {'ms/fetch':>9}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for rows in row_counts:
+            project_id = fill(rows)
+
+            async def edit_project(client, number):
+                await client.put(f"/api/projects/{project_id}", json={"progress_percentage": number % 101})
+
+            async def start_sprint(client, number):
+                await client.post("/api/assistant/sprint/start", json={"task": f"Edit {number}", "duration_minutes": 25})
+
+            for label, path, edit in (
+                ("GET /api/projects/", "/api/projects/", edit_project),
+                ("GET /api/assistant/sprint/all", "/api/assistant/sprint/all", start_sprint),
+            ):
+                baseline = None
+                for name, encoding, conditional in strategies:
+                    result = await replay(client, path, edit, refetches, edit_every, encoding, conditional)
+                    baseline = baseline or result["bytes"]
+                    print(f"{label:<30} {rows:>6} {name:<12} {result['bytes'] / 1024:>9.1f} "
+                          f"{result['bytes'] / refetches:>9.0f}B {1 - result['bytes'] / baseline:>6.1%} "
+                          f"{result['not_modified']:>5} {result['ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="200,1000", help="comma-separated collection sizes")
+    parser.add_argument("--refetches", type=int, default=50)
+    parser.add_argument("--edit-every", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main([int(value) for value in args.rows.split(",")], args.refetches, args.edit_every))
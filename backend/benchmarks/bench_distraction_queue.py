@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Distraction logging: one transaction per request vs the write-behind queue
+
+Starts a few sprints, then has concurrent clients fire distractions at
+them through POST /api/assistant/sprint/{id}/distraction, first with
+direct writes and then with the write-behind queue running. Reports
+request latency and throughput, the queue's flush statistics, and checks
+that every distraction reached the table and the rollups.
+
+Set SQLITE_SYNCHRONOUS=FULL (or SQLITE_PROFILE=rollback) to include a
+full fsync per commit, as on a durable configuration.
+
+Usage:
+    python benchmarks/bench_distraction_queue.py [--clients 20] [--per-client 100] [--sprints 3]
+"""
+
+import argparse
+import asyncio
+import time
+
+from _common import use_temp_database, percentile, format_ms
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from main import app  # noqa: E402
+from core.database import init_db, AsyncSessionLocal  # noqa: E402
+from core.distraction_queue import distraction_queue  # noqa: E402
+from models import SprintDistraction, SprintRollup  # noqa: E402
+
+
+async def fire(client, sprint_ids: list, clients: int, per_client: int) -> list:
+    samples = []
+
+    async def one_client(index: int):
+        for number in range(per_client):
+            sprint_id = sprint_ids[(index + number) % len(sprint_ids)]
+            started = time.perf_counter()
+            response = await client.post(
+                f"/api/assistant/sprint/{sprint_id}/distraction", params={"distraction": f"ping {index}/{number}"}
+            )
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(one_client(index) for index in range(clients)))
+    return samples
+
+
+async def counts() -> tuple:
+    async with AsyncSessionLocal() as db:
+        rows = await db.scalar(select(func.count()).select_from(SprintDistraction))
+        rolled_up = await db.scalar(
+            select(func.coalesce(func.sum(SprintRollup.distractions), 0)).where(SprintRollup.period == "day")
+        )
+    return rows, rolled_up
+
+
+def report(label: str, samples: list, elapsed: float):
+    print(f"{label:<14} {len(samples) / elapsed:>9.0f}/s {format_ms(percentile(samples, 50)):>10} "
+          f"{format_ms(percentile(samples, 99)):>10} {elapsed:>8.2f}s")
+
+
+async def main(clients: int, per_client: int, sprints: int):
+    await init_db()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        sprint_ids = []
+        for number in range(sprints):
+            response = await client.post(
+                "/api/assistant/sprint/start", json={"task": f"Noisy sprint {number}", "duration_minutes": 25}
+            )
+            sprint_ids.append(response.json()["id"])
+
+        print(f"{clients} clients x {per_client} distractions over {sprints} sprints\n")
+        print(f"{'mode':<14} {'throughput':>11} {'p50':>10} {'p99':>10} {'elapsed':>9}")
+
+        started = time.perf_counter()
+        samples = await fire(client, sprint_ids, clients, per_client)
+        report("direct", samples, time.perf_counter() - started)
+
+        await distraction_queue.start()
+        started = time.perf_counter()
+        samples = await fire(client, sprint_ids, clients, per_client)
+        accepted = time.perf_counter() - started
+        await distraction_queue.stop()
+        report("write-behind", samples, accepted)
+        print(f"{'':<14} all rows written {time.perf_counter() - started:.2f}s after the first request")
+
+    stats = distraction_queue.stats()
+    print(f"\nQueue: {stats['flushes']} flushes, avg batch {stats['avg_batch_size']:.1f}, "
+          f"avg flush {stats['avg_flush_ms']:.2f}ms, {stats['rejected']} rejected, {stats['flush_failures']} failures")
+
+    expected = 2 * clients * per_client
+    rows, rolled_up = await counts()
+    print(f"Rows: {rows}/{expected} in sprint_distractions, {rolled_up}/{expected} in the day rollups")
+    assert rows == rolled_up == expected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--per-client", type=int, default=100)
+    parser.add_argument("--sprints", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.per_client, args.sprints))
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Index benchmark: seed a large history and check the hot queries' plans
+
+Seeds --sprints sprints (default 1M) plus distractions and projects into
+a throwaway SQLite database built by init_db (create_all + migrations),
+a quarter of them owned by a user and the rest in the shared scope. Then
+asserts that EXPLAIN QUERY PLAN for each hot-path query, as the routes
+run it for the shared scope (owner_id IS NULL) and for a user
+(owner_id = ?), uses the expected index without a full scan or temp
+B-tree sort, and reports the average query time.
+
+Usage:
+    python benchmarks/bench_indexes.py [--sprints 1000000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from _common import use_temp_database, format_ms
+
+use_temp_database()
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.dialects import sqlite  # noqa: E402
+from core.auth import owned_by  # noqa: E402
+from core.database import engine, init_db  # noqa: E402
+from models import Sprint, SprintDistraction, Project  # noqa: E402
+
+CHUNK = 50_000
+BENCH_OWNER = "bench-user"
+
+
+def owner_of(i: int):
+    return BENCH_OWNER if i % 4 == 1 else None
+
+
+def seed(sprint_count: int, project_count: int):
+    started = datetime(2020, 1, 1)
+    statuses = ["completed"] * 97 + ["cancelled"] * 2 + ["active"]
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        sprint_ids = []
+        for offset in range(0, sprint_count, CHUNK):
+            rows = []
+            for i in range(offset, min(offset + CHUNK, sprint_count)):
+                sprint_id = str(uuid.uuid4())
+                created = started + timedelta(minutes=i * 3)
+                rows.append((
+                    sprint_id, owner_of(i), f"Sprint {i}", 25, created, created + timedelta(minutes=25),
+                    random.choice(statuses), created, created
+                ))
+                if i % 4 == 0:
+                    sprint_ids.append(sprint_id)
+            cursor.executemany(
+                "INSERT INTO sprints (id, owner_id, task, duration_minutes, start_time, end_time, status, created_at, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        cursor.executemany(
+            "INSERT INTO sprint_distractions (id, sprint_id, distraction, timestamp, addressed) VALUES (?, ?, ?, ?, 0)",
+            ((str(uuid.uuid4()), sprint_id, "checked phone", started) for sprint_id in sprint_ids)
+        )
+        cursor.executemany(
+            "INSERT INTO projects (id, owner_id, title, status, priority, created_at, updated_at, progress_percentage, "
+            "is_high_priority, is_completed) VALUES (?, ?, ?, ?, ?, ?, ?, 0, 0, 0)",
+            (
+                (str(uuid.uuid4()), owner_of(i), f"Project {i}", random.choice(["active", "completed", "on_hold"]),
+                 random.choice(["high", "medium", "low"]), started, started)
+                for i in range(project_count)
+            )
+        )
+        raw.commit()
+        cursor.execute("ANALYZE")
+        raw.commit()
+        return sprint_ids[:50]
+    finally:
+        raw.close()
+
+
+def hot_queries(sample_ids):
+    queries = [
+        (
+            "scheduler active sprints",
+            select(Sprint.id).filter(Sprint.status == "active"),
+            "ix_sprints_status_created_at",
+        ),
+        (
+            "distractions for page",
+            select(SprintDistraction).filter(SprintDistraction.sprint_id.in_(sample_ids)),
+            "ix_sprint_distractions_sprint_id",
+        ),
+    ]
+    # The per-owner queries as the routes run them, for both scopes
+    for scope, owner_id in (("shared", None), ("user", BENCH_OWNER)):
+        queries += [
+            (
+                f"active sprint ({scope})",
+                select(Sprint)
+                .filter(owned_by(Sprint.owner_id, owner_id), Sprint.status == "active")
+                .order_by(Sprint.created_at.desc()).limit(1),
+                "ix_sprints_owner_status_created_at",
+            ),
+            (
+                f"sprint history ({scope})",
+                select(Sprint)
+                .filter(owned_by(Sprint.owner_id, owner_id))
+                .order_by(Sprint.created_at.desc(), Sprint.id.desc()).limit(51),
+                "ix_sprints_owner_created_at_id",
+            ),
+            (
+                f"projects page ({scope})",
+                select(Project)
+                .filter(owned_by(Project.owner_id, owner_id))
+                .order_by(Project.created_at, Project.id).limit(201),
+                "ix_projects_owner_created_at_id",
+            ),
+            (
+                f"projects by priority ({scope})",
+                select(Project).filter(owned_by(Project.owner_id, owner_id), Project.priority == "high"),
+                "ix_projects_owner_priority_created_at",
+            ),
+            (
+                f"projects by status ({scope})",
+                select(Project).filter(owned_by(Project.owner_id, owner_id), Project.status == "on_hold"),
+                "ix_projects_owner_status_created_at",
+            ),
+        ]
+    return queries
+
+
+def check_plans(sample_ids, repeats: int) -> bool:
+    ok = True
+    with engine.connect() as conn:
+        for label, query, index_name in hot_queries(sample_ids):
+            sql = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+            uses_index = any(index_name in step for step in plan)
+            full_scan = any(step.startswith("SCAN") and "INDEX" not in step for step in plan)
+            temp_sort = any("TEMP B-TREE" in step for step in plan)
+            passed = uses_index and not full_scan and not temp_sort
+
+            started = time.perf_counter()
+            for _ in range(repeats):
+                conn.exec_driver_sql(sql).fetchall()
+            elapsed = (time.perf_counter() - started) / repeats
+
+            print(f"{'PASS' if passed else 'FAIL'}  {label:<32} {format_ms(elapsed):>10}  {' | '.join(plan)}")
+            ok = ok and passed
+    return ok
+
+
+def main(sprint_count: int, project_count: int, repeats: int):
+    asyncio.run(init_db())
+    started = time.perf_counter()
+    sample_ids = seed(sprint_count, project_count)
+    print(f"seeded {sprint_count} sprints, {project_count} projects in {time.perf_counter() - started:.1f}s")
+    if not check_plans(sample_ids, repeats):
+        raise SystemExit("one or more hot queries do not use their index")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sprints", type=int, default=1_000_000)
+    parser.add_argument("--projects", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sprints, args.projects, args.repeats)
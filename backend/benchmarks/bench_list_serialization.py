@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+List endpoint serialization: ORM + Pydantic vs column tuples + orjson
+
+Fills a database with N projects and N sprints (one distraction each),
+then walks every page of GET /api/projects/?limit=1000 and
+GET /api/assistant/sprint/all?limit=200 in-process, through the current
+handlers and through copies of the previous ones (ORM instances,
+per-row Pydantic models, jsonable_encoder / response_model validation)
+mounted under /bench/legacy. Reports CPU time per full walk, the largest
+peak allocation of a single page request, and checks both paths return
+the same JSON.
+
+Usage:
+    python benchmarks/bench_list_serialization.py [--rows 10000,100000]
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from _common import use_temp_database
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from fastapi import Depends, Query, Response  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import delete, insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+from main import app  # noqa: E402
+from api.routes.assistant import SprintPage, SprintResponse  # noqa: E402
+from api.routes.projects import Project  # noqa: E402
+from core.database import engine, init_db, get_async_db  # noqa: E402
+from core.pagination import encode_cursor, decode_cursor, keyset_condition  # noqa: E402
+from models import Project as ProjectModel, Sprint, SprintDistraction  # noqa: E402
+
+PROJECT_PAGE = 1000
+SPRINT_PAGE = 200
+
+
+async def legacy_projects(
+    response: Response,
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """GET /api/projects/ before the fast path (default sort, no filters)"""
+    query = select(ProjectModel).filter(ProjectModel.owner_id.is_(None))
+    if cursor:
+        _, *after = decode_cursor(cursor, 3)
+        query = query.filter(keyset_condition((ProjectModel.created_at, ProjectModel.id), after, (False, False)))
+    result = await db.execute(query.order_by(ProjectModel.created_at, ProjectModel.id).limit(limit + 1))
+    projects = result.scalars().all()
+    if len(projects) > limit:
+        projects = projects[:limit]
+        last = projects[-1]
+        next_cursor = encode_cursor(["created_at", last.created_at, last.id])
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [jsonable_encoder(Project.model_validate(project).model_dump()) for project in projects]
+
+
+async def legacy_sprints(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """GET /api/assistant/sprint/all before the fast path"""
+    sort_columns = (Sprint.created_at, Sprint.id)
+    query = (
+        select(Sprint)
+        .options(selectinload(Sprint.distractions))
+        .filter(Sprint.owner_id.is_(None))
+        .order_by(Sprint.created_at.desc(), Sprint.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.filter(keyset_condition(sort_columns, decode_cursor(cursor, 2), (True, True)))
+    sprints = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(sprints) > limit:
+        sprints = sprints[:limit]
+        next_cursor = encode_cursor([sprints[-1].created_at, sprints[-1].id])
+    return SprintPage(
+        sprints=[
+            SprintResponse(
+                id=sprint.id, task=sprint.task, duration_minutes=sprint.duration_minutes,
+                start_time=sprint.start_time, end_time=sprint.end_time, status=sprint.status,
+                distractions=[d.distraction for d in sprint.distractions],
+            )
+            for sprint in sprints
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+app.add_api_route("/bench/legacy/projects", legacy_projects, methods=["GET"], response_model=None)
+app.add_api_route("/bench/legacy/sprints", legacy_sprints, methods=["GET"], response_model=SprintPage)
+
+
+def fill(rows: int):
+    """Replace all projects and sprints with `rows` of each"""
+    base = datetime(2024, 1, 1)
+    projects, sprints, distractions = [], [], []
+    for number in range(rows):
+        created = base + timedelta(minutes=number, microseconds=number % 997)
+        projects.append({
+            "id": str(uuid.uuid4()), "title": f"Project {number}", "description": "Benchmark project " * 3,
+            "priority": ("low", "medium", "high")[number % 3], "status": "active", "category": "bench",
+            "progress_percentage": number % 101, "is_high_priority": number % 7 == 0, "is_completed": False,
+            "created_at": created, "updated_at": created, "due_date": created + timedelta(days=30) if number % 2 else None,
+        })
+        sprint_id = str(uuid.uuid4())
+        sprints.append({
+            "id": sprint_id, "task": f"Sprint {number}", "duration_minutes": 25, "status": "completed",
+            "start_time": created, "end_time": created + timedelta(minutes=25), "created_at": created,
+            "updated_at": created,
+        })
+        distractions.append({"id": str(uuid.uuid4()), "sprint_id": sprint_id, "distraction": "phone", "timestamp": created})
+    with engine.begin() as connection:
+        for model in (SprintDistraction, Sprint, ProjectModel):
+            connection.execute(delete(model))
+        connection.execute(insert(ProjectModel), projects)
+        connection.execute(insert(Sprint), sprints)
+        connection.execute(insert(SprintDistraction), distractions)
+
+
+async def traced_get(client, path: str, params: dict, peaks: Optional[list]):
+    """GET a page; with `peaks`, also record the memory the request allocated at its peak"""
+    if peaks is not None:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    response = await client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    if peaks is not None:
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    return response
+
+
+async def walk_projects(client, path: str, peaks: Optional[list] = None) -> list:
+    pages, cursor = [], None
+    while True:
+        response = await traced_get(client, path, {"limit": PROJECT_PAGE, **({"cursor": cursor} if cursor else {})}, peaks)
+        if peaks is None:
+            pages.append(response.content)
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return pages
+
+
+async def walk_sprints(client, path: str, peaks: Optional[list] = None) -> list:
+    pages, cursor = [], None
+    while True:
+        response = await traced_get(client, path, {"limit": SPRINT_PAGE, **({"cursor": cursor} if cursor else {})}, peaks)
+        if peaks is None:
+            pages.append(response.content)
+        cursor = response.json()["next_cursor"]
+        if not cursor:
+            return pages
+
+
+async def measure(walk, client, path: str) -> tuple:
+    """
+    (pages, CPU seconds, largest per-request peak allocation); memory is
+    traced on a second walk so tracing doesn't skew the timing
+    """
+    gc.collect()
+    cpu = time.process_time()
+    pages = await walk(client, path)
+    cpu = time.process_time() - cpu
+    gc.collect()
+    peaks = []
+    tracemalloc.start()
+    await walk(client, path, peaks)
+    tracemalloc.stop()
+    return pages, cpu, max(peaks)
+
+
+async def main(row_counts: list):
+    await init_db()
+    print(f"{'endpoint':<28} {'rows':>7} {'pages':>6} {'legacy cpu':>11} {'fast cpu':>9} {'speedup':>8} "
+          f"{'legacy peak/req':>16} {'fast peak/req':>14}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for rows in row_counts:
+            fill(rows)
+            for label, walk, legacy_path, fast_path in (
+                ("GET /api/projects/", walk_projects, "/bench/legacy/projects", "/api/projects/"),
+                ("GET /api/assistant/sprint/all", walk_sprints, "/bench/legacy/sprints", "/api/assistant/sprint/all"),
+            ):
+                await walk(client, fast_path)  # warm caches
+                legacy_pages, legacy_cpu, legacy_peak = await measure(walk, client, legacy_path)
+                fast_pages, fast_cpu, fast_peak = await measure(walk, client, fast_path)
+                assert [httpx.Response(200, content=page).json() for page in legacy_pages] == \
+                       [httpx.Response(200, content=page).json() for page in fast_pages], f"{label}: bodies differ"
+                print(f"{label:<28} {rows:>7} {len(fast_pages):>6} {legacy_cpu:>10.2f}s {fast_cpu:>8.2f}s "
+                      f"{legacy_cpu / fast_cpu:>7.1f}x {legacy_peak / 1e6:>14.2f}MB {fast_peak / 1e6:>12.2f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10000,100000", help="comma-separated collection sizes")
+    args = parser.parse_args()
+    asyncio.run(main([int(value) for value in args.rows.split(",")]))
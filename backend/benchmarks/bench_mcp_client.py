@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+MCP client benchmark against a local stub MCP server
+
+1. Fast server: per-call latency of the old pattern (a new
+   httpx.AsyncClient per call) versus the shared pooled MCPClient.
+2. Slow server: a burst of concurrent calls against a server slower than
+   the client timeout, reporting outcomes, wall time and peak open
+   file descriptors for both patterns.
+
+Usage:
+    python benchmarks/bench_mcp_client.py [--calls 300] [--burst 200]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from _common import percentile, format_ms
+
+import httpx  # noqa: E402
+from core.mcp_client import MCPClient, MCPClientError, CircuitBreaker  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_stub(port: int, delay: float) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "mcp_stub_server.py"), "--port", str(port), "--delay", str(delay)]
+    )
+    for _ in range(100):
+        try:
+            httpx.post(f"http://127.0.0.1:{port}/tool", json={"tool": "ping", "parameters": {}}, timeout=delay + 1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit("stub MCP server did not start")
+
+
+def open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+
+async def legacy_call(url: str, timeout: float):
+    # The pre-pooling behaviour of execute_mcp_tool
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        response = await client.post(f"{url}/tool", json={"tool": "calendar.today", "parameters": {}})
+        response.raise_for_status()
+        return response.json()
+
+
+async def latency_run(call, calls: int):
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def burst_run(call, burst: int):
+    outcomes = Counter()
+    peak = {"fds": open_fds()}
+
+    async def one():
+        try:
+            await call()
+            outcomes["ok"] += 1
+        except MCPClientError as e:
+            outcomes[type(e).__name__] += 1
+        except httpx.HTTPError as e:
+            outcomes[type(e).__name__] += 1
+
+    async def monitor(stop: asyncio.Event):
+        while not stop.is_set():
+            peak["fds"] = max(peak["fds"], open_fds())
+            await asyncio.sleep(0.01)
+
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(monitor(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(burst)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await watcher
+    return outcomes, elapsed, peak
+
+
+async def main(calls: int, burst: int, slow_delay: float, timeout: float, port: int):
+    url = f"http://127.0.0.1:{port}"
+
+    stub = start_stub(port, 0.0)
+    try:
+        client = MCPClient(base_url=url, timeout=timeout)
+        await client.start()
+        await latency_run(lambda: client.call_tool("calendar.today", {}), 10)  # warm the pool
+        legacy = await latency_run(lambda: legacy_call(url, timeout), calls)
+        pooled = await latency_run(lambda: client.call_tool("calendar.today", {}), calls)
+        await client.close()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    print(f"fast server, {calls} sequential calls")
+    print(f"  {'pattern':<22} {'p50':>10} {'p99':>10}")
+    for label, samples in (("client per call", legacy), ("pooled MCPClient", pooled)):
+        print(f"  {label:<22} {format_ms(percentile(samples, 50)):>10} {format_ms(percentile(samples, 99)):>10}")
+
+    stub = start_stub(port, slow_delay)
+    try:
+        legacy_outcomes, legacy_elapsed, legacy_peak = await burst_run(lambda: legacy_call(url, timeout), burst)
+        client = MCPClient(
+            base_url=url,
+            timeout=timeout,
+            max_concurrency=10,
+            queue_timeout=0.1,
+            breaker=CircuitBreaker(failure_threshold=5, reset_timeout=30.0),
+        )
+        await client.start()
+        pooled_outcomes, pooled_elapsed, pooled_peak = await burst_run(
+            lambda: client.call_tool("calendar.today", {}), burst
+        )
+        stats = client.stats()
+        await client.close()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    print(f"\nslow server ({slow_delay}s per call, client timeout {timeout}s), burst of {burst}")
+    for label, outcomes, elapsed, peak in (
+        ("client per call", legacy_outcomes, legacy_elapsed, legacy_peak),
+        ("pooled MCPClient", pooled_outcomes, pooled_elapsed, pooled_peak),
+    ):
+        print(f"  {label:<22} wall {elapsed:6.2f}s  peak fds {peak['fds']:>4}  outcomes {dict(outcomes)}")
+    print(f"  pooled upstream calls in flight never exceeded {client.max_concurrency}; "
+          f"circuit state {stats['circuit_state']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--burst", type=int, default=200)
+    parser.add_argument("--slow-delay", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=3901)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.burst, args.slow_delay, args.timeout, args.port))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Overhead of the request metrics middleware and query timing hooks
+
+Times GET /health and a page of /api/projects/ in-process with
+RequestMetricsMiddleware installed and with it stripped from the app,
+then times bare `SELECT 1` round trips on an engine with and without the
+cursor event hooks. Ends with a sample of the /metrics output.
+
+Usage:
+    python benchmarks/bench_metrics.py [--requests 2000] [--queries 20000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from _common import use_temp_database, percentile, format_ms
+
+database_path = use_temp_database()
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from main import app  # noqa: E402
+from core.database import init_db  # noqa: E402
+from core.metrics import metrics, MetricsRegistry, RequestMetricsMiddleware  # noqa: E402
+from utils.seed_data import seed_all_data  # noqa: E402
+
+PATHS = ["/health", "/api/projects/?limit=50"]
+
+
+def set_middleware(enabled: bool):
+    """Rebuild the app's middleware stack with or without request metrics"""
+    if not hasattr(app, "_all_user_middleware"):
+        app._all_user_middleware = list(app.user_middleware)
+    app.user_middleware = [
+        middleware for middleware in app._all_user_middleware
+        if enabled or middleware.cls is not RequestMetricsMiddleware
+    ]
+    app.middleware_stack = None
+
+
+async def time_requests(path: str, count: int) -> list:
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get(path)
+        for _ in range(count):
+            started = time.perf_counter()
+            response = await client.get(path)
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200
+    return samples
+
+
+def time_queries(count: int, watched: bool) -> list:
+    engine = create_engine(f"sqlite:///{database_path}")
+    if watched:
+        MetricsRegistry().watch_engine(engine)
+    samples = []
+    with engine.connect() as connection:
+        statement = text("SELECT 1")
+        for _ in range(count):
+            started = time.perf_counter()
+            connection.execute(statement).scalar()
+            samples.append(time.perf_counter() - started)
+    engine.dispose()
+    return samples
+
+
+def report(label: str, samples: list):
+    mean = sum(samples) / len(samples)
+    print(f"{label:<40} {format_ms(percentile(samples, 50)):>10} {format_ms(percentile(samples, 99)):>10} "
+          f"{mean * 1e6:>9.1f}us")
+
+
+async def main(requests: int, queries: int):
+    await init_db()
+    seed_all_data()
+
+    print(f"{'':<40} {'p50':>10} {'p99':>10} {'mean':>11}")
+    for path in PATHS:
+        for enabled in (False, True):
+            set_middleware(enabled)
+            report(f"GET {path} metrics {'on' if enabled else 'off'}", await time_requests(path, requests))
+    for watched in (False, True):
+        report(f"SELECT 1 query hooks {'on' if watched else 'off'}", time_queries(queries, watched))
+
+    print("\nSample of /metrics:")
+    for line in metrics.render().splitlines():
+        if line.startswith(("http_requests_total", "http_request_db_queries_sum", "http_request_duration_seconds_sum")):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.queries))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Project query API benchmark at 100k projects
+
+Seeds --projects rows, then times GET /api/projects/ for a set of filter /
+sort / projection combinations (first page and a deep page reached by
+following X-Next-Cursor), and prints the SQLite plan for each query
+shape to confirm it is served from an index.
+
+Usage:
+    python benchmarks/bench_project_query.py [--projects 100000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from _common import use_temp_database, percentile, format_ms
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+from core.database import engine, init_db  # noqa: E402
+
+PAGE_SIZE = 200
+SCENARIOS = [
+    ("default sort", {}),
+    ("status filter", {"status": "active"}),
+    ("status + priority", {"status": "active", "priority": "high"}),
+    ("category, newest first", {"category": "Chi Life", "sort": "-created_at"}),
+    ("due date range", {"due_after": "2022-01-01", "due_before": "2022-03-01"}),
+    ("projection", {"fields": "title,status", "sort": "-updated_at"}),
+]
+
+PLAN_QUERIES = [
+    ("status + created_at", "SELECT id FROM projects WHERE status IN ('active') ORDER BY created_at, id LIMIT 201"),
+    ("category + created_at", "SELECT id FROM projects WHERE category = 'Chi Life' ORDER BY created_at DESC, id DESC LIMIT 201"),
+    ("due date range", "SELECT id FROM projects WHERE due_date >= '2022-01-01' AND due_date < '2022-03-01'"),
+]
+
+
+def seed(count: int):
+    started = datetime(2021, 1, 1)
+    categories = ["Chi Life", "Family", "Technical", "Community", "Client Work", None]
+    rows = []
+    for i in range(count):
+        created = started + timedelta(minutes=i * 7)
+        due = created + timedelta(days=random.randint(1, 400)) if i % 3 else None
+        rows.append((
+            str(uuid.uuid4()), f"Project {i}", random.choice(["active", "completed", "on_hold", "cancelled"]),
+            random.choice(["high", "medium", "low"]), random.choice(categories), created, created, due,
+            random.randint(0, 100), i % 10 == 0
+        ))
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.executemany(
+            "INSERT INTO projects (id, title, status, priority, category, created_at, updated_at, due_date, "
+            "progress_percentage, is_high_priority, is_completed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            rows
+        )
+        cursor.execute("ANALYZE")
+        raw.commit()
+    finally:
+        raw.close()
+
+
+async def time_scenario(client, params: dict, repeats: int, deep_pages: int):
+    # Without a limit the endpoint returns every match; time the paged path
+    params = {"limit": PAGE_SIZE, **params}
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = await client.get("/api/projects/", params=params)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+
+    cursor, deep = response.headers.get("x-next-cursor"), []
+    for _ in range(deep_pages):
+        if not cursor:
+            break
+        started = time.perf_counter()
+        response = await client.get("/api/projects/", params={**params, "cursor": cursor})
+        deep.append(time.perf_counter() - started)
+        cursor = response.headers.get("x-next-cursor")
+    return samples, deep
+
+
+async def main(count: int, repeats: int, deep_pages: int):
+    await init_db()
+    started = time.perf_counter()
+    seed(count)
+    print(f"seeded {count} projects in {time.perf_counter() - started:.1f}s\n")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'scenario':<26} {'first p50':>10} {'first p99':>10} {'deep p50':>10} {'pages':>6}")
+        for label, params in SCENARIOS:
+            first, deep = await time_scenario(client, params, repeats, deep_pages)
+            print(
+                f"{label:<26} {format_ms(percentile(first, 50)):>10} {format_ms(percentile(first, 99)):>10} "
+                f"{format_ms(percentile(deep, 50)):>10} {len(deep):>6}"
+            )
+
+    print("\nquery plans")
+    with engine.connect() as conn:
+        for label, sql in PLAN_QUERIES:
+            plan = " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+            print(f"  {label:<24} {plan}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--deep-pages", type=int, default=25)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.repeats, args.deep_pages))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Vectorized sprint reports vs an ORM loop at 1M sprints
+
+Seeds --sprints sprints (about one distraction per sprint) spread over
+several years, then builds the heatmap, 30-day trend and distraction
+profile twice: once with core.sprint_reports (columns into NumPy arrays)
+and once by streaming ORM objects and aggregating in Python. Results are
+cross-checked before timings are printed.
+
+Usage:
+    python benchmarks/bench_reports.py [--sprints 1000000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from _common import use_temp_database
+
+use_temp_database()
+
+import numpy as np  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from core.database import engine, init_db, AsyncSessionLocal, SessionLocal  # noqa: E402
+from core.sprint_reports import (  # noqa: E402
+    load_sprint_columns, load_distraction_columns,
+    focus_heatmap, productivity_trend, distraction_profile,
+)
+from models import Sprint, SprintDistraction  # noqa: E402
+
+CHUNK = 50_000
+
+
+def seed(count: int):
+    started = datetime(2021, 1, 1, 6)
+    step = timedelta(days=5 * 365) / count
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        # Search indexing isn't measured here; skip it to keep seeding fast
+        for table in ("sprints", "sprint_distractions"):
+            for suffix in ("insert", "update", "delete"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+        for offset in range(0, count, CHUNK):
+            sprints, distractions = [], []
+            for i in range(offset, min(offset + CHUNK, count)):
+                sprint_id = str(uuid.uuid4())
+                start = started + step * i + timedelta(hours=random.randint(0, 14))
+                planned = random.choice([15, 25, 30, 45, 50, 90])
+                status = random.choices(["completed", "expired", "active"], weights=[80, 15, 5])[0]
+                actual = start + timedelta(minutes=planned * random.uniform(0.5, 1.5)) if status != "active" else None
+                sprints.append((sprint_id, f"Task {i}", planned, start, start + timedelta(minutes=planned), actual, status, start, start))
+                for _ in range(random.choice([0, 0, 1, 1, 2, 3])):
+                    at = start + timedelta(minutes=random.expovariate(1 / (planned / 2)))
+                    distractions.append((str(uuid.uuid4()), sprint_id, "phone", at))
+            cursor.executemany(
+                "INSERT INTO sprints (id, task, duration_minutes, start_time, end_time, actual_end_time, status, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                sprints
+            )
+            cursor.executemany(
+                "INSERT INTO sprint_distractions (id, sprint_id, distraction, timestamp, addressed) VALUES (?, ?, ?, ?, 0)",
+                distractions
+            )
+            raw.commit()
+    finally:
+        raw.close()
+
+
+async def vectorized():
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        sprints = await load_sprint_columns(db)
+        distractions = await load_distraction_columns(db)
+        loaded = time.perf_counter()
+        reports = (focus_heatmap(sprints), productivity_trend(sprints, 30), distraction_profile(distractions, 5))
+        finished = time.perf_counter()
+    return reports, loaded - started, finished - loaded, len(sprints), len(distractions)
+
+
+def orm_loop():
+    """The straightforward version: iterate ORM objects and accumulate in dicts"""
+    started = time.perf_counter()
+    focus = defaultdict(float)
+    daily_focus = defaultdict(float)
+    daily_started = defaultdict(int)
+    daily_completed = defaultdict(int)
+    since_start = []
+    with SessionLocal() as db:
+        for sprint in db.execute(select(Sprint).execution_options(yield_per=5000)).scalars():
+            minutes = 0.0
+            completed = sprint.status == "completed" and sprint.actual_end_time is not None
+            if completed:
+                minutes = max(0.0, (sprint.actual_end_time - sprint.start_time).total_seconds() / 60)
+            focus[(sprint.start_time.weekday(), sprint.start_time.hour)] += minutes
+            day = sprint.start_time.date()
+            daily_focus[day] += minutes
+            daily_started[day] += 1
+            daily_completed[day] += completed
+        query = select(SprintDistraction, Sprint.start_time).join(Sprint).execution_options(yield_per=5000)
+        for distraction, start_time in db.execute(query):
+            since_start.append(max(0.0, (distraction.timestamp - start_time).total_seconds() / 60))
+
+    # Rolling 30-day focus over every calendar day
+    days = sorted(daily_focus)
+    day, rolling, window = days[0], [], []
+    while day <= days[-1]:
+        window.append(daily_focus.get(day, 0.0))
+        rolling.append(sum(window[-30:]))
+        day += timedelta(days=1)
+    since_start.sort()
+    median = since_start[len(since_start) // 2]
+    return {"focus": focus, "rolling": rolling, "median": median}, time.perf_counter() - started
+
+
+def check(reports, baseline):
+    heatmap, trend, profile = reports
+    # Timestamps reach the NumPy path via SQLite date functions, which round
+    # to the millisecond, so a sprint starting within 0.5ms of the hour can
+    # land in the neighbouring cell
+    expected = np.zeros((7, 24))
+    for (weekday, hour), minutes in baseline["focus"].items():
+        expected[weekday, hour] = minutes
+    actual = np.array(heatmap["focus_minutes"])
+    assert abs(actual.sum() - expected.sum()) < 1e-6 * expected.sum() + 1
+    assert (np.abs(actual - expected) > 0.5).sum() <= 2
+    assert len(trend["days"]) == len(baseline["rolling"])
+    assert np.allclose([day["rolling_focus_minutes"] for day in trend["days"]], baseline["rolling"], atol=200)
+    assert abs(profile["percentiles"]["p50_minutes"] - baseline["median"]) < 0.1
+
+
+async def main(count: int):
+    await init_db()
+    started = time.perf_counter()
+    seed(count)
+    print(f"seeded {count} sprints in {time.perf_counter() - started:.1f}s\n")
+
+    reports, load_seconds, compute_seconds, sprints, distractions = await vectorized()
+    baseline, orm_seconds = orm_loop()
+    check(reports, baseline)
+
+    vectorized_seconds = load_seconds + compute_seconds
+    print(f"{sprints} sprints, {distractions} distractions; reports match\n")
+    print(f"{'path':<28} {'seconds':>10}")
+    print(f"{'ORM loop':<28} {orm_seconds:>10.2f}")
+    print(f"{'NumPy: load columns':<28} {load_seconds:>10.2f}")
+    print(f"{'NumPy: compute 3 reports':<28} {compute_seconds:>10.3f}")
+    print(f"{'NumPy total':<28} {vectorized_seconds:>10.2f}  ({orm_seconds / vectorized_seconds:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sprints", type=int, default=1_000_000)
+    args = parser.parse_args()
+    np.seterr(all="ignore")
+    asyncio.run(main(args.sprints))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Full-text search benchmark over a million indexed rows
+
+Seeds projects, sprints and distractions (default 1M rows in total)
+through the normal tables so the FTS triggers build the indexes, then
+times /api/search for common query shapes and reports p50/p99 against a
+10ms target.
+
+Usage:
+    python benchmarks/bench_search.py [--rows 1000000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from _common import use_temp_database, percentile, format_ms
+
+use_temp_database()
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+from core.database import engine, init_db  # noqa: E402
+from api.routes.search import _match_expression  # noqa: E402
+
+TARGET = 0.010
+CHUNK = 50_000
+TOPICS = (
+    "chi life flyers cards advertising campaign council discord assistant sprint ritual journal family "
+    "email inbox calendar review design marketing website launch budget invoice client meeting research "
+    "draft outline video podcast newsletter photos workshop class schedule report planning roadmap bug "
+    "deploy backend frontend database cleanup refactor tests docs slides pitch proposal contract"
+).split()
+# Zipf-distributed vocabulary so term frequencies look like real notes
+# rather than every document containing every topic word
+SYLLABLES = "ka lo mi ne ru ta vo shi ze pa".split()
+VOCABULARY = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES] + TOPICS
+random.Random(14).shuffle(VOCABULARY)
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+DISTRACTIONS = ["checked phone", "slack message", "email notification", "snack break", "news site", "text from kids"]
+QUERIES = [
+    ("single rare term", "podcast"),
+    ("phrase-like", "chi life flyers"),
+    ("natural question", "when did I last work on Chi Life flyers?"),
+    ("prefix", "market"),
+    ("distractions only", "phone", {"kinds": "distraction"}),
+    ("most recent", "invoice client", {"sort": "recent"}),
+]
+
+
+def sentence(n: int) -> str:
+    return " ".join(random.choices(VOCABULARY, weights=WEIGHTS, k=n))
+
+
+def seed(total: int):
+    projects, sprints = total // 10, total * 3 // 10
+    distractions = total - projects - sprints
+    started = datetime(2019, 1, 1)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for offset in range(0, projects, CHUNK):
+            cursor.executemany(
+                "INSERT INTO projects (id, title, description, status, priority, created_at, updated_at, "
+                "progress_percentage, is_high_priority, is_completed) VALUES (?, ?, ?, 'active', 'medium', ?, ?, 0, 0, 0)",
+                [
+                    (str(uuid.uuid4()), sentence(4), sentence(20), started, started + timedelta(hours=i))
+                    for i in range(offset, min(offset + CHUNK, projects))
+                ]
+            )
+        sprint_ids = []
+        for offset in range(0, sprints, CHUNK):
+            rows = []
+            for i in range(offset, min(offset + CHUNK, sprints)):
+                sprint_id = str(uuid.uuid4())
+                sprint_ids.append(sprint_id)
+                start = started + timedelta(minutes=i * 20)
+                rows.append((sprint_id, sentence(5), sentence(12), start, start + timedelta(minutes=25), sentence(15), start, start))
+            cursor.executemany(
+                "INSERT INTO sprints (id, task, description, duration_minutes, start_time, end_time, status, "
+                "retrospective, created_at, updated_at) VALUES (?, ?, ?, 25, ?, ?, 'completed', ?, ?, ?)",
+                rows
+            )
+        for offset in range(0, distractions, CHUNK):
+            cursor.executemany(
+                "INSERT INTO sprint_distractions (id, sprint_id, distraction, timestamp, addressed) VALUES (?, ?, ?, ?, 0)",
+                [
+                    (str(uuid.uuid4()), random.choice(sprint_ids), f"{random.choice(DISTRACTIONS)} {sentence(3)}", started + timedelta(minutes=i * 7))
+                    for i in range(offset, min(offset + CHUNK, distractions))
+                ]
+            )
+            raw.commit()
+        for kind in ("project", "sprint", "distraction"):
+            cursor.execute(f"INSERT INTO search_{kind}(search_{kind}) VALUES ('optimize')")
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def count_matches(q: str, kinds: str = None) -> int:
+    """Documents matching a query across the searched kinds"""
+    match = _match_expression(q, "any")
+    with engine.connect() as connection:
+        return sum(
+            connection.exec_driver_sql(f"SELECT count(*) FROM search_{kind} WHERE search_{kind} MATCH ?", (match,)).scalar()
+            for kind in (kinds.split(",") if kinds else ("project", "sprint", "distraction"))
+        )
+
+
+async def timed(client: httpx.AsyncClient, path: str, params: dict, repeats: int):
+    await client.get(path, params=params)  # warm the page cache
+    samples = []
+    for _ in range(repeats):
+        begun = time.perf_counter()
+        response = await client.get(path, params=params)
+        samples.append(time.perf_counter() - begun)
+    assert response.status_code == 200, response.text
+    return samples
+
+
+async def main(total: int, repeats: int):
+    await init_db()
+    started = time.perf_counter()
+    seed(total)
+    print(f"seeded and indexed {total} rows in {time.perf_counter() - started:.1f}s\n")
+
+    transport = httpx.ASGITransport(app=app)
+    failures = 0
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = await timed(client, "/health", {}, repeats)
+        print(f"request overhead (/health) p50 {format_ms(percentile(baseline, 50))}\n")
+        print(f"{'query':<20} {'matches':>8} {'p50':>10} {'p99':>10}")
+        for label, q, *extra in QUERIES:
+            params = {"q": q, **(extra[0] if extra else {})}
+            samples = await timed(client, "/api/search/", params, repeats)
+            p50 = percentile(samples, 50)
+            failures += p50 > TARGET
+            print(f"{label:<20} {count_matches(q, params.get('kinds')):>8} {format_ms(p50):>10} "
+                  f"{format_ms(percentile(samples, 99)):>10}{'' if p50 <= TARGET else '  (over target)'}")
+    print(f"\n{len(QUERIES) - failures}/{len(QUERIES)} query shapes under {format_ms(TARGET)} at p50")
+    print("relevance cost grows with the number of matching documents (bm25 reads every match once)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeats))
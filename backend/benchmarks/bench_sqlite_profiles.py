@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Concurrent readers and writers against each SQLite storage profile
+
+For every profile a fresh database is seeded, then several worker
+processes (each standing in for one server process) hit the same file
+at once. In each worker, reader tasks page through /api/projects/ and
+the sprint history while writer tasks start sprints, log distractions,
+complete them and create/update projects, all in-process through the
+ASGI app. Reports throughput, latency and how many requests failed with
+"database is locked" per profile.
+
+Usage:
+    python benchmarks/bench_sqlite_profiles.py [--profiles rollback,wal,wal_mmap]
+        [--processes 2] [--readers 4] [--writers 2] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import percentile, format_ms
+
+HERE = os.path.abspath(__file__)
+
+READ_PATHS = [
+    "/api/projects/?limit=50",
+    "/api/projects/?status=active&limit=20",
+    "/api/assistant/sprint/all?limit=20",
+    "/api/assistant/sprint/active",
+]
+
+
+def profile_env(profile: str, database_path: str) -> dict:
+    # Only production mode honours DATABASE_URL, see core/config.py
+    return {
+        **os.environ,
+        "ENVIRONMENT": "production",
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "SQLITE_PROFILE": profile,
+    }
+
+
+class Tally:
+    def __init__(self):
+        self.read_latency = []
+        self.write_latency = []
+        self.locked = 0
+        self.errors = 0
+
+    async def call(self, client, method: str, path: str, write: bool, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception as exc:  # unhandled errors surface from ASGITransport
+            failure = str(exc)
+        else:
+            if response.status_code < 400:
+                (self.write_latency if write else self.read_latency).append(time.perf_counter() - started)
+                return response
+            failure = response.text
+        if "database is locked" in failure:
+            self.locked += 1
+        else:
+            self.errors += 1
+        return None
+
+
+async def reader(client, tally: Tally, deadline: float):
+    while time.perf_counter() < deadline:
+        await tally.call(client, "GET", random.choice(READ_PATHS), False)
+
+
+async def writer(client, tally: Tally, deadline: float, project_ids: list):
+    while time.perf_counter() < deadline:
+        if random.random() < 0.5:
+            response = await tally.call(
+                client, "POST", "/api/assistant/sprint/start", True,
+                json={"task": "Benchmark sprint", "duration_minutes": 25},
+            )
+            if response is None:
+                continue
+            sprint_id = response.json()["id"]
+            for _ in range(2):
+                await tally.call(
+                    client, "POST", f"/api/assistant/sprint/{sprint_id}/distraction", True,
+                    params={"distraction": "phone"},
+                )
+            await tally.call(
+                client, "POST", f"/api/assistant/sprint/{sprint_id}/complete", True, params={"retro": "done"}
+            )
+        elif random.random() < 0.5 or not project_ids:
+            response = await tally.call(
+                client, "POST", "/api/projects/", True, json={"title": "Benchmark project", "category": "bench"}
+            )
+            if response is not None:
+                project_ids.append(response.json()["id"])
+        else:
+            await tally.call(
+                client, "PUT", f"/api/projects/{random.choice(project_ids)}", True,
+                json={"priority": random.choice(["low", "medium", "high"])},
+            )
+
+
+async def run_worker(readers: int, writers: int, seconds: float, start_at: float):
+    import logging
+    import httpx
+    from main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    tally = Tally()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        project_ids = [project["id"] for project in (await client.get("/api/projects/?limit=200")).json()]
+        # Workers start together so every process contends for the whole run
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(reader(client, tally, deadline) for _ in range(readers)),
+            *(writer(client, tally, deadline, project_ids) for _ in range(writers)),
+        )
+    print(json.dumps({
+        "read_latency": tally.read_latency,
+        "write_latency": tally.write_latency,
+        "locked": tally.locked,
+        "errors": tally.errors,
+    }))
+
+
+async def setup_database():
+    import models  # noqa: F401  (register tables before create_all)
+    from core.database import init_db
+    from utils.seed_data import seed_all_data
+
+    await init_db()
+    seed_all_data()
+
+
+def run_profile(profile: str, args) -> dict:
+    directory = tempfile.mkdtemp(prefix="assistant-bench-")
+    env = profile_env(profile, os.path.join(directory, "benchmark.db"))
+    try:
+        subprocess.run([sys.executable, HERE, "--setup"], env=env, check=True, stdout=subprocess.DEVNULL)
+        start_at = time.time() + 3.0  # time for every worker to import the app
+        workers = [
+            subprocess.Popen(
+                [sys.executable, HERE, "--worker", "--readers", str(args.readers), "--writers", str(args.writers),
+                 "--seconds", str(args.seconds), "--start-at", str(start_at)],
+                env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            for _ in range(args.processes)
+        ]
+        results = []
+        for worker in workers:
+            stdout, stderr = worker.communicate()
+            if worker.returncode:
+                raise SystemExit(f"{profile} worker failed:\n{stderr}")
+            results.append(json.loads(stdout.strip().splitlines()[-1]))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "read_latency": [sample for result in results for sample in result["read_latency"]],
+        "write_latency": [sample for result in results for sample in result["write_latency"]],
+        "locked": sum(result["locked"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+    }
+
+
+def main(args):
+    print(f"{args.processes} processes x ({args.readers} readers + {args.writers} writers), {args.seconds:g}s per profile\n")
+    print(f"{'profile':<10} {'reads/s':>9} {'writes/s':>9} {'read p50':>10} {'read p99':>10} "
+          f"{'write p50':>10} {'write p99':>10} {'locked':>14} {'other err':>10}")
+    for profile in args.profiles.split(","):
+        result = run_profile(profile, args)
+        reads, writes = result["read_latency"], result["write_latency"]
+        attempts = len(reads) + len(writes) + result["locked"] + result["errors"]
+        locked_rate = result["locked"] / attempts * 100 if attempts else 0.0
+        print(f"{profile:<10} {len(reads) / args.seconds:>9.1f} {len(writes) / args.seconds:>9.1f} "
+              f"{format_ms(percentile(reads, 50)):>10} {format_ms(percentile(reads, 99)):>10} "
+              f"{format_ms(percentile(writes, 50)):>10} {format_ms(percentile(writes, 99)):>10} "
+              f"{result['locked']:>6} ({locked_rate:4.1f}%) {result['errors']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="rollback,wal,wal_mmap")
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--setup", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.setup:
+        asyncio.run(setup_database())
+    elif args.worker:
+        asyncio.run(run_worker(args.readers, args.writers, args.seconds, args.start_at))
+    else:
+        main(args)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Cold start: import cost and time to the first healthy /health
+
+Runs `python -X importtime -c "import main"` and reports the total import
+time of the app, the heaviest top-level packages, and whether the
+optional heavy modules were loaded. Then boots the server the way Render
+does (`python main.py`, production mode) and times spawn to the first
+200 from /health for:
+
+- first boot: empty database, so create_all, migrations and seeding run
+- warm boot: same database, schema and seed versions current
+- state reset: same database with app_state cleared, i.e. the old
+  behaviour of re-running create_all, migrations and the seed checks
+
+Results can be saved and later compared to catch regressions:
+
+    python benchmarks/bench_startup.py --save startup.json
+    python benchmarks/bench_startup.py --compare startup.json --tolerance 0.25
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3] [--port 8765]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Should not be imported by `import main`
+LAZY_MODULES = ["numpy", "alembic", "openai", "anthropic", "langchain", "celery", "redis"]
+
+
+def app_env(database_path: str, port: int) -> dict:
+    # Only production mode honours DATABASE_URL, see core/config.py
+    return {
+        **os.environ,
+        "ENVIRONMENT": "production",
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "PORT": str(port),
+    }
+
+
+def import_profile(env: dict) -> tuple:
+    """(total ms, {top-level package: self ms}, set of imported module names) for `import main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    total_us, packages, modules = 0, defaultdict(int), set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.add(name)
+        packages[name.split(".")[0]] += int(self_us)
+        if name == "main":
+            total_us = int(cumulative_us)
+    return total_us / 1000, {package: us / 1000 for package, us in packages.items()}, modules
+
+
+def time_to_health(env: dict, port: int, timeout: float = 60.0) -> float:
+    """Seconds from spawning the server to its first 200 on /health"""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                if server.poll() is not None:
+                    raise SystemExit(f"server exited with {server.returncode} before becoming healthy")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise SystemExit(f"/health not ready after {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def reset_app_state(database_path: str):
+    connection = sqlite3.connect(database_path)
+    with connection:
+        connection.execute("DELETE FROM app_state")
+    connection.close()
+
+
+def measure(runs: int, port: int) -> dict:
+    directory = tempfile.mkdtemp(prefix="assistant-bench-")
+    try:
+        env = app_env(os.path.join(directory, "benchmark.db"), port)
+
+        imports = [import_profile(env) for _ in range(runs)]
+        import_ms = statistics.median(total for total, _, _ in imports)
+        packages = imports[-1][1]
+        loaded = sorted(name for name in LAZY_MODULES if name in imports[-1][2])
+
+        boots = defaultdict(list)
+        for run in range(runs):
+            database_path = os.path.join(directory, f"boot-{run}.db")
+            env = app_env(database_path, port)
+            boots["first boot"].append(time_to_health(env, port))
+            boots["warm boot"].append(time_to_health(env, port))
+            reset_app_state(database_path)
+            boots["state reset"].append(time_to_health(env, port))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "import_main_ms": import_ms,
+        "top_packages_ms": dict(sorted(packages.items(), key=lambda item: -item[1])[:10]),
+        "lazy_modules_loaded": loaded,
+        "time_to_health_ms": {label: statistics.median(samples) * 1000 for label, samples in boots.items()},
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the change against a saved run; False if anything regressed past the tolerance"""
+    ok = True
+    current = {"import main": result["import_main_ms"], **result["time_to_health_ms"]}
+    previous = {"import main": baseline["import_main_ms"], **baseline["time_to_health_ms"]}
+    print(f"\nAgainst baseline (tolerance {tolerance:.0%}):")
+    for label, value in current.items():
+        if label not in previous:
+            continue
+        change = value / previous[label] - 1
+        regressed = change > tolerance
+        ok = ok and not regressed
+        print(f"  {label:<14} {previous[label]:>8.0f}ms -> {value:>8.0f}ms {change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    if baseline.get("lazy_modules_loaded") != result["lazy_modules_loaded"]:
+        newly = sorted(set(result["lazy_modules_loaded"]) - set(baseline.get("lazy_modules_loaded", [])))
+        if newly:
+            ok = False
+            print(f"  now imported at startup: {', '.join(newly)}  REGRESSION")
+    return ok
+
+
+def main(args):
+    result = measure(args.runs, args.port)
+    print(f"import main: {result['import_main_ms']:.0f}ms (median of {args.runs})")
+    for package, ms in result["top_packages_ms"].items():
+        print(f"  {package:<20} {ms:>7.1f}ms")
+    loaded = result["lazy_modules_loaded"]
+    print(f"optional heavy modules imported: {', '.join(loaded) if loaded else 'none'}")
+    print("\nspawn to first healthy /health:")
+    for label, ms in result["time_to_health_ms"].items():
+        print(f"  {label:<14} {ms:>8.0f}ms")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing, 0.2 = 20%%")
+    main(parser.parse_args())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in for the MCP server's POST /tool endpoint
+
+Echoes the requested tool and parameters after an optional artificial
+delay, so client behaviour can be measured without a real MCP server.
+
+Usage:
+    python benchmarks/mcp_stub_server.py [--port 3901] [--delay 0.0]
+"""
+
+import argparse
+import asyncio
+import json
+
+import uvicorn
+
+DELAY = 0.0
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    if DELAY:
+        await asyncio.sleep(DELAY)
+    request = json.loads(body or b"{}")
+    payload = json.dumps({"tool": request.get("tool"), "result": request.get("parameters")}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=3901)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering")
+    args = parser.parse_args()
+    DELAY = args.delay
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
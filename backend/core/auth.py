@@ -0,0 +1,200 @@
+"""
+Authentication helpers shared by the routes
+
+- A bounded TTL cache of verified JWT claims, so repeat requests with the
+  same bearer token skip signature verification. Entries never outlive
+  the token's own `exp`.
+- bcrypt hashing on a dedicated, size-capped thread pool so login and
+  registration bursts never block the event loop or starve the default
+  executor used by other endpoints.
+- Request ownership: tokens carry the user id (`uid`), so scoping a query
+  to the caller needs no user lookup. Requests without a token use the
+  shared scope, owner_id IS NULL.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import bcrypt
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+
+from core.config import settings
+
+# OAuth2 scheme for token authentication
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# Same, for endpoints that also serve anonymous requests
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+# bcrypt only uses the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+
+class PasswordHasherOverloaded(Exception):
+    """Too many hashing requests are already queued"""
+
+
+class PasswordHasher:
+    """bcrypt on its own thread pool, with a bounded wait for a free worker"""
+
+    def __init__(self, max_concurrency: int = 2, queue_timeout: float = 5.0, rounds: int = 12):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="bcrypt")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.counters = {"hashed": 0, "verified": 0, "rejected_overloaded": 0}
+        self.in_flight = 0
+        self._seconds_total = 0.0
+
+    @staticmethod
+    def _encode(password: str) -> bytes:
+        return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+    def hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(self._encode(password), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify_sync(self, password: str, hashed: str) -> bool:
+        try:
+            return bcrypt.checkpw(self._encode(password), hashed.encode())
+        except ValueError:
+            return False  # malformed stored hash
+
+    async def _run(self, counter: str, fn, *args):
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.counters["rejected_overloaded"] += 1
+            raise PasswordHasherOverloaded("Too many concurrent password operations")
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self._seconds_total += time.perf_counter() - started
+            self.counters[counter] += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hashed", self.hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verified", self.verify_sync, password, hashed)
+
+    def stats(self) -> dict:
+        completed = self.counters["hashed"] + self.counters["verified"]
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "avg_ms": (self._seconds_total / completed * 1000) if completed else 0.0,
+        }
+
+
+@dataclass
+class TokenClaimsCache:
+    """LRU of verified claims keyed by the raw token, each entry capped by the token's exp"""
+    ttl: float
+    max_entries: int
+    _entries: "OrderedDict[str, tuple]" = field(default_factory=OrderedDict)
+    counters: Dict[str, int] = field(default_factory=lambda: {"hits": 0, "misses": 0, "evictions": 0})
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end(token)
+        self.counters["hits"] += 1
+        return claims
+
+    def put(self, token: str, claims: dict):
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        self._entries[token] = (expires_at, claims)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self.counters, "size": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
+
+
+password_hasher = PasswordHasher(
+    max_concurrency=settings.auth_hash_max_concurrency,
+    queue_timeout=settings.auth_hash_queue_timeout_seconds,
+)
+
+token_claims_cache = TokenClaimsCache(
+    ttl=settings.auth_token_cache_ttl_seconds,
+    max_entries=settings.auth_token_cache_max_entries,
+)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verified claims for a token, from the cache when possible; raises JWTError"""
+    claims = token_claims_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        token_claims_cache.put(token, claims)
+    return claims
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    user_id: str
+    username: str
+    claims: dict
+
+
+def _authenticate(token: str) -> AuthenticatedUser:
+    credentials_exception = HTTPException(
+        status_code=401,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        claims = decode_access_token(token)
+    except JWTError:
+        raise credentials_exception
+    username, user_id = claims.get("sub"), claims.get("uid")
+    # Tokens issued before users were stored carry no uid
+    if username is None or user_id is None:
+        raise credentials_exception
+    return AuthenticatedUser(user_id=user_id, username=username, claims=claims)
+
+
+async def current_user(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
+    """Dependency resolving the bearer token to the authenticated user"""
+    return _authenticate(token)
+
+
+async def optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[AuthenticatedUser]:
+    """Like current_user, but None for requests without a token (an invalid token is still a 401)"""
+    return _authenticate(token) if token else None
+
+
+async def request_owner(user: Optional[AuthenticatedUser] = Depends(optional_user)) -> Optional[str]:
+    """Dependency giving the owner_id that scopes this request's data (None: shared scope)"""
+    return user.user_id if user else None
+
+
+def owned_by(column, owner_id: Optional[str]):
+    """Filter on an owner_id column; IS NULL for the shared scope so the index still applies"""
+    return column.is_(None) if owner_id is None else column == owner_id
@@ -0,0 +1,93 @@
+"""
+Build metadata resolved once per process
+
+Lookup order:
+1. build_info.json next to the backend package, written at build time by
+   `python -m core.build_info` (see render.yaml)
+2. Render's RENDER_GIT_COMMIT / RENDER_GIT_BRANCH environment variables
+3. A single `git` call at import time
+"""
+
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime
+
+BUILD_SUFFIX = "v4"
+BUILD_INFO_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "build_info.json")
+
+
+@dataclass(frozen=True)
+class BuildInfo:
+    git_revision: str
+    git_branch: str
+    built_at: str
+    started_at: str
+
+    @property
+    def build_version(self) -> str:
+        return f"{self.git_revision}-{BUILD_SUFFIX}"
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.check_output(["git", *args], stderr=subprocess.DEVNULL).decode().strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def resolve_build_info() -> BuildInfo:
+    started_at = datetime.now().isoformat()
+
+    if os.path.exists(BUILD_INFO_FILE):
+        try:
+            with open(BUILD_INFO_FILE) as f:
+                data = json.load(f)
+            return BuildInfo(
+                git_revision=data.get("git_revision", "unknown"),
+                git_branch=data.get("git_branch", "unknown"),
+                built_at=data.get("built_at", started_at),
+                started_at=started_at,
+            )
+        except (OSError, ValueError):
+            pass
+
+    commit = os.getenv("RENDER_GIT_COMMIT")
+    if commit:
+        return BuildInfo(
+            git_revision=commit[:7],
+            git_branch=os.getenv("RENDER_GIT_BRANCH", "unknown"),
+            built_at=started_at,
+            started_at=started_at,
+        )
+
+    return BuildInfo(
+        git_revision=_git("rev-parse", "--short", "HEAD"),
+        git_branch=_git("branch", "--show-current"),
+        built_at=started_at,
+        started_at=started_at,
+    )
+
+
+# Resolved once at import; shared by every endpoint that reports the build
+build_info = resolve_build_info()
+
+
+def write_build_info_file(path: str = BUILD_INFO_FILE) -> dict:
+    """Capture the current git state into build_info.json (run at build time)"""
+    data = {
+        "git_revision": _git("rev-parse", "--short", "HEAD"),
+        "git_branch": _git("branch", "--show-current"),
+        "built_at": datetime.now().isoformat(),
+    }
+    if data["git_revision"] == "unknown" and os.getenv("RENDER_GIT_COMMIT"):
+        data["git_revision"] = os.environ["RENDER_GIT_COMMIT"][:7]
+        data["git_branch"] = os.getenv("RENDER_GIT_BRANCH", "unknown")
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+if __name__ == "__main__":
+    print(json.dumps(write_build_info_file(), indent=2))
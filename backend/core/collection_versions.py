@@ -0,0 +1,95 @@
+"""
+Write versions for list collections, used as collection-level ETags
+
+Each collection (projects, sprints) has a counter that is bumped by any
+write to its tables: unit-of-work flushes (create/update/delete routes)
+and ORM-enabled insert/update/delete statements (bulk import, sprint
+expiry, batched distractions). Like ritual_cache, a write bumps the
+version as soon as it is flushed and again after it commits, so a list
+read racing the write can't keep the old ETag for the new data.
+
+The ETag is built from the version alone, so a conditional GET whose tag
+still matches is answered with 304 without touching the database. The
+counters live in this process; a random token per process is part of the
+tag so tags never survive a restart.
+"""
+
+import hashlib
+import secrets
+import threading
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import Project, Sprint, SprintDistraction
+
+COLLECTION_TABLES = {
+    "projects": (Project.__tablename__,),
+    "sprints": (Sprint.__tablename__, SprintDistraction.__tablename__),
+}
+
+
+class CollectionVersions:
+    def __init__(self, tables: Dict[str, tuple]):
+        self._lock = threading.Lock()
+        self._versions = {name: 0 for name in tables}
+        self._by_table = {table: name for name, names in tables.items() for table in names}
+        self.boot = secrets.token_hex(4)
+
+    def collections_for(self, table_names: Iterable[str]) -> set:
+        return {self._by_table[name] for name in table_names if name in self._by_table}
+
+    def version(self, name: str) -> int:
+        return self._versions[name]
+
+    def bump(self, names: Iterable[str]):
+        with self._lock:
+            for name in names:
+                self._versions[name] += 1
+
+    def etag(self, name: str, owner_id: Optional[str], query: str) -> str:
+        """
+        Weak ETag for one owner's view of a collection with the given query
+        string. Read it before querying: a write landing mid-request then
+        only costs the client one extra full response.
+        """
+        variant = hashlib.sha256(f"{owner_id}\n{query}".encode()).hexdigest()[:16]
+        return f'W/"{name}-{self.boot}-{self._versions[name]}-{variant}"'
+
+
+collection_versions = CollectionVersions(COLLECTION_TABLES)
+
+
+def _mark_dirty(session, names: set):
+    if names:
+        session.info.setdefault("collections_dirty", set()).update(names)
+        collection_versions.bump(names)
+
+
+def _after_flush(session, flush_context):
+    tables = {
+        instance.__table__.name
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(instance, "__table__")
+    }
+    _mark_dirty(session, collection_versions.collections_for(tables))
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _mark_dirty(orm_execute_state.session, collection_versions.collections_for([table.name]))
+
+
+def _bump_after_commit(session):
+    names = session.info.pop("collections_dirty", None)
+    if names:
+        collection_versions.bump(names)
+
+
+event.listen(Session, "after_flush", _after_flush)
+event.listen(Session, "do_orm_execute", _do_orm_execute)
+event.listen(Session, "after_commit", _bump_after_commit)
+event.listen(Session, "after_rollback", lambda session: session.info.pop("collections_dirty", None))
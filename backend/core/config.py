@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 import os
 
 
@@ -11,11 +11,36 @@ class Settings(BaseSettings):
     
     # Database - Use absolute path to ensure it works from any directory
     database_url: str = "sqlite:///./backend/ai_assistant.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1
+    # SQLite storage profile applied to every new connection, see
+    # SQLITE_PROFILES in core/database.py ("rollback", "wal", "wal_mmap");
+    # the sqlite_* fields below override single PRAGMAs of the profile
+    sqlite_profile: str = "wal"
+    sqlite_busy_timeout_ms: Optional[int] = None
+    sqlite_synchronous: Optional[str] = None
+    sqlite_mmap_size: Optional[int] = None
+    sqlite_cache_size: Optional[int] = None
+    sqlite_temp_store: Optional[str] = None
+    # Dev/test query inspection: slow-query log and N+1 detection
+    # (unset: on when DEBUG is)
+    db_query_inspection: Optional[bool] = None
+    db_slow_query_ms: float = 100.0
+    db_n_plus_one_threshold: int = 5
+    project_bulk_batch_size: int = 500
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Verified JWT claims are cached per token (never past the token's exp)
+    auth_token_cache_ttl_seconds: float = 300.0
+    auth_token_cache_max_entries: int = 10000
+    # bcrypt runs on its own thread pool of this size
+    auth_hash_max_concurrency: int = 2
+    auth_hash_queue_timeout_seconds: float = 5.0
     
     # AI Services
     openai_api_key: Optional[str] = None
@@ -24,7 +49,49 @@ class Settings(BaseSettings):
     # MCP Integration
     mcp_server_url: str = "http://localhost:3001"
     mcp_auth_token: Optional[str] = None
+    mcp_timeout_seconds: float = 10.0
+    mcp_connect_timeout_seconds: float = 2.0
+    mcp_max_connections: int = 20
+    mcp_max_keepalive_connections: int = 10
+    mcp_keepalive_expiry_seconds: float = 30.0
+    mcp_http2: bool = False
+    mcp_max_concurrency: int = 20
+    mcp_queue_timeout_seconds: float = 1.0
+    mcp_max_retries: int = 1
+    mcp_breaker_failure_threshold: int = 5
+    mcp_breaker_reset_seconds: float = 30.0
+    mcp_batch_max_parallel: int = 8
+    mcp_batch_max_items: int = 50
+    # Opt-in result cache: tool name (or fnmatch pattern) -> TTL seconds,
+    # e.g. MCP_CACHE_TTLS='{"calendar.*": 60, "search": 30}'
+    mcp_cache_enabled: bool = True
+    mcp_cache_ttls: Dict[str, float] = {}
+    mcp_cache_max_entries: int = 1000
     
+    # Live sprint event stream (SSE)
+    sse_heartbeat_seconds: float = 15.0
+
+    # Write-behind distraction logging: accept distractions at once and
+    # insert them in batches (off: one transaction per distraction)
+    distraction_write_behind: bool = False
+    distraction_batch_size: int = 100
+    distraction_flush_interval_seconds: float = 0.5
+    distraction_max_pending: int = 10000
+
+    # Server-side sprint timer
+    sprint_nudge_interval_minutes: float = 15.0
+    sprint_expiry_grace_minutes: float = 0.0
+
+    # Request metrics: add a Server-Timing header (app/db/mcp time) to responses
+    server_timing_header: bool = True
+
+    # Compress responses of at least this many bytes (brotli when the
+    # client accepts br, else gzip)
+    response_compression: bool = True
+    compression_minimum_size: int = 1024
+    gzip_compresslevel: int = 6
+    brotli_quality: int = 4
+
     # External Services
     google_calendar_credentials: Optional[str] = None
     whatsapp_api_key: Optional[str] = None
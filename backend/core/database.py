@@ -1,45 +1,465 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData, Table, Column, String, DateTime, select, update, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
+from core.metrics import metrics, current_request, route_template
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
 import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import weakref
 
+logger = logging.getLogger(__name__)
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgres:"):
+        return url.replace("postgres:", "postgresql+asyncpg:", 1)
+    return url
+
+
+def _pool_options(url: str) -> dict:
+    """Connection pool sizing from settings (in-memory SQLite uses a singleton pool)"""
+    if ":memory:" in url:
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+# PRAGMAs run on every new SQLite connection, picked by settings.sqlite_profile.
+# busy_timeout comes first so the journal_mode switch itself waits for locks.
+SQLITE_PROFILES = {
+    # Rollback journal: a writer blocks readers for the length of its commit
+    "rollback": {
+        "journal_mode": "DELETE",
+    },
+    # WAL: readers and the single writer no longer block each other.
+    # synchronous=NORMAL stays consistent after a crash but may drop the
+    # last commits on power loss.
+    "wal": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,  # KiB
+        "temp_store": "MEMORY",
+    },
+    # wal plus memory-mapped reads and a larger page cache
+    "wal_mmap": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+    },
+}
+
+_SQLITE_KEYWORDS = {
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+
+def _sqlite_pragmas(url: str) -> dict:
+    """The storage profile's PRAGMAs with any per-setting overrides"""
+    if not url.startswith("sqlite"):
+        return {}
+    if settings.sqlite_profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PROFILE {settings.sqlite_profile!r}, expected one of {', '.join(SQLITE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_PROFILES[settings.sqlite_profile])
+    overrides = {
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+    for name, value in overrides.items():
+        if value is None:
+            continue
+        if name in _SQLITE_KEYWORDS:
+            # Interpolated into the PRAGMA, so only known keywords pass
+            value = value.upper()
+            if value not in _SQLITE_KEYWORDS[name]:
+                raise ValueError(f"Invalid SQLITE_{name.upper()} {value!r}")
+        pragmas[name] = value
+    if "busy_timeout" in pragmas:
+        pragmas = {"busy_timeout": pragmas.pop("busy_timeout"), **pragmas}
+    if ":memory:" in url:
+        # In-memory databases have no journal file to switch or map
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+    return pragmas
+
+
+def apply_sqlite_pragmas(sync_engine, pragmas: dict):
+    """Run the PRAGMAs on each connection the engine opens (async engines: pass .sync_engine)"""
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+sqlite_pragmas = _sqlite_pragmas(settings.database_url)
 
 # Database engine and session
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+    **_pool_options(settings.database_url)
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session used by the request handlers so database I/O
+# never blocks the event loop
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    **_pool_options(settings.database_url)
+)
+
+apply_sqlite_pragmas(engine, sqlite_pragmas)
+apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
 # Metadata
 metadata = MetaData()
 
+# Small key/value store for what startup has already done to this database
+# (schema fingerprint, seed data version)
+app_state = Table(
+    "app_state",
+    Base.metadata,
+    Column("key", String, primary_key=True),
+    Column("value", String, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+class PoolStats:
+    """Connection pool and session lifecycle counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.sessions_opened = 0
+        self.sessions_closed = 0
+        self.sessions_leaked = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def watch_engine(self, sync_engine):
+        """Count checkouts/checkins on an engine's pool"""
+        @event.listens_for(sync_engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(sync_engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self.checkins += 1
+
+    def track_session(self, session) -> dict:
+        """
+        Register a session; the returned marker must be passed to
+        session_closed. Sessions garbage collected without being closed
+        are counted as leaked.
+        """
+        marker = {"closed": False}
+        with self._lock:
+            self.sessions_opened += 1
+        weakref.finalize(session, self._on_session_collected, marker)
+        return marker
+
+    def session_closed(self, marker: dict):
+        marker["closed"] = True
+        with self._lock:
+            self.sessions_closed += 1
+
+    def record_wait(self, seconds: float):
+        """Record how long a session waited to get a pooled connection"""
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def _on_session_collected(self, marker: dict):
+        if not marker["closed"]:
+            with self._lock:
+                self.sessions_leaked += 1
+
+    @staticmethod
+    def _pool_snapshot(pool) -> dict:
+        snapshot = {"class": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                snapshot[name] = method()
+        return snapshot
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pools": {
+                    "sync": self._pool_snapshot(engine.pool),
+                    "async": self._pool_snapshot(async_engine.sync_engine.pool),
+                },
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checkouts - self.checkins,
+                "sessions": {
+                    "opened": self.sessions_opened,
+                    "closed": self.sessions_closed,
+                    "open": self.sessions_opened - self.sessions_closed,
+                    "leaked": self.sessions_leaked,
+                },
+                "wait": {
+                    "count": self.wait_count,
+                    "avg_ms": (self.wait_total / self.wait_count * 1000) if self.wait_count else 0.0,
+                    "max_ms": self.wait_max * 1000,
+                },
+                "config": {
+                    "pool_size": settings.db_pool_size,
+                    "max_overflow": settings.db_max_overflow,
+                    "pool_timeout": settings.db_pool_timeout,
+                    "sqlite_profile": settings.sqlite_profile if sqlite_pragmas else None,
+                    "sqlite_pragmas": sqlite_pragmas,
+                },
+            }
+
+
+pool_stats = PoolStats()
+pool_stats.watch_engine(engine)
+pool_stats.watch_engine(async_engine.sync_engine)
+metrics.watch_engine(engine)
+metrics.watch_engine(async_engine.sync_engine)
+
+
+def _compact_sql(statement: str, limit: int = 300) -> str:
+    statement = re.sub(r"\s+", " ", statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + "…"
+
+
+class QueryInspector:
+    """
+    Dev/test query diagnostics. Statements slower than slow_query_ms are
+    logged with the route that issued them, and a request that runs the
+    same SQL n_plus_one_threshold or more times (a lazy load or a query
+    inside a loop) is flagged as a suspected N+1 when it finishes.
+    """
+
+    def __init__(self, slow_query_ms: float, n_plus_one_threshold: int, history: int = 100):
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_queries = deque(maxlen=history)
+        self.n_plus_one = deque(maxlen=history)
+        self.enabled = False
+
+    def enable(self, *sync_engines):
+        for sync_engine in sync_engines:
+            self._watch_engine(sync_engine)
+        metrics.request_observers.append(self._check_request)
+        self.enabled = True
+
+    def _watch_engine(self, sync_engine):
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("inspector_started", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (time.perf_counter() - conn.info["inspector_started"].pop()) * 1000
+            timing = current_request()
+            if timing is not None:
+                if timing.statements is None:
+                    timing.statements = {}
+                timing.statements[statement] = timing.statements.get(statement, 0) + 1
+            if elapsed_ms >= self.slow_query_ms:
+                origin = f"{timing.scope['method']} {route_template(timing.scope)}" if timing else "background"
+                self.slow_queries.append({
+                    "origin": origin, "ms": round(elapsed_ms, 1), "statement": _compact_sql(statement)
+                })
+                logger.warning(f"Slow query ({elapsed_ms:.1f} ms) from {origin}: {_compact_sql(statement)}")
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _handle_error(exception_context):
+            connection = exception_context.connection
+            if connection is not None and connection.info.get("inspector_started"):
+                connection.info["inspector_started"].pop()
+
+    def _check_request(self, method: str, route: str, status: int, seconds: float, timing):
+        for statement, count in (timing.statements or {}).items():
+            if count >= self.n_plus_one_threshold:
+                self.n_plus_one.append({
+                    "origin": f"{method} {route}", "executions": count, "statement": _compact_sql(statement)
+                })
+                logger.warning(
+                    f"Suspected N+1 in {method} {route}: same statement ran {count} times: {_compact_sql(statement)}"
+                )
+
+    def report(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "slow_queries": list(self.slow_queries),
+            "suspected_n_plus_one": list(self.n_plus_one),
+        }
+
+
+query_inspector = QueryInspector(settings.db_slow_query_ms, settings.db_n_plus_one_threshold)
+if settings.db_query_inspection if settings.db_query_inspection is not None else settings.debug:
+    query_inspector.enable(engine, async_engine.sync_engine)
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, "migrations", "versions")
+
+
+def get_app_state(key: str) -> Optional[str]:
+    """A value from app_state, or None if unset (or the table doesn't exist yet)"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(app_state.c.value).where(app_state.c.key == key)).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def set_app_state(key: str, value: str):
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        updated = connection.execute(
+            update(app_state).where(app_state.c.key == key).values(value=value, updated_at=now)
+        )
+        if not updated.rowcount:
+            connection.execute(insert(app_state).values(key=key, value=value, updated_at=now))
+
+
+def schema_fingerprint() -> str:
+    """
+    Hash of the declared tables, columns and indexes plus the migration
+    files, so any model or migration change makes startup rebuild the schema
+    """
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(f"table {table.name}\n".encode())
+        for column in table.columns:
+            digest.update(f"  {column.name} {column.type!r} {column.nullable} {column.primary_key}\n".encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(f"  index {index.name} {[column.name for column in index.columns]} {index.unique}\n".encode())
+    if os.path.isdir(MIGRATIONS_DIR):
+        for name in sorted(os.listdir(MIGRATIONS_DIR)):
+            if name.endswith(".py"):
+                with open(os.path.join(MIGRATIONS_DIR, name), "rb") as f:
+                    digest.update(name.encode() + f.read())
+    return digest.hexdigest()[:16]
+
+
+def run_migrations(bind=None):
+    """Upgrade the schema (of `bind`, default the app's engine) to the latest Alembic revision"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    with (bind or engine).begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
 
 async def init_db():
     """Initialize database tables"""
     try:
-        # Create all tables
+        fingerprint = schema_fingerprint()
+        if get_app_state("schema_version") == fingerprint:
+            print("Database schema is current")
+            return
+        # Create all tables, then apply migrations for databases that
+        # predate newer schema changes (indexes etc.)
         Base.metadata.create_all(bind=engine)
+        run_migrations()
+        set_app_state("schema_version", fingerprint)
         print("Database initialized successfully")
-    except Exception as e:
-        print(f"Error initializing database: {e}")
+    except Exception:
+        # Serving on a half-migrated schema fails later and less clearly
+        logger.exception("Error initializing database")
+        raise
 
 
 def get_db():
-    """Get database session"""
+    """Request-scoped database session dependency"""
     db = SessionLocal()
+    marker = pool_stats.track_session(db)
     try:
+        started = time.perf_counter()
+        db.connection()
+        pool_stats.record_wait(time.perf_counter() - started)
         yield db
     finally:
         db.close()
+        pool_stats.session_closed(marker)
+
 
+async def get_async_db():
+    """Async request-scoped database session dependency"""
+    async with AsyncSessionLocal() as db:
+        marker = pool_stats.track_session(db)
+        try:
+            started = time.perf_counter()
+            await db.connection()
+            pool_stats.record_wait(time.perf_counter() - started)
+            yield db
+        finally:
+            await db.close()
+            pool_stats.session_closed(marker)
 
-# Database dependency for FastAPI
-def get_db_session():
-    """Database session dependency"""
-    return next(get_db())
+
+@contextmanager
+def session_scope():
+    """Database session for scripts and startup tasks, always closed on exit"""
+    db = SessionLocal()
+    marker = pool_stats.track_session(db)
+    try:
+        yield db
+    finally:
+        db.close()
+        pool_stats.session_closed(marker)
@@ -0,0 +1,208 @@
+"""
+Write-behind queue for sprint distractions
+
+With DISTRACTION_WRITE_BEHIND on, log_distraction hands the new row to
+this queue and answers at once with the id and timestamp generated here.
+A background task inserts pending distractions in one transaction per
+batch, with the matching sprint_rollups deltas, as soon as
+distraction_batch_size rows are waiting or distraction_flush_interval_seconds
+after the first one arrived; the search index follows through its
+triggers. Stopping the queue (application shutdown) flushes whatever is
+left. Until a batch is flushed its distractions are not visible to reads.
+
+When the queue is not running or is full, enqueue returns None and the
+caller writes the distraction itself.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.metrics import Histogram, LATENCY_BUCKETS, metrics
+from core.sprint_stats import apply_rollup_delta
+from models import SprintDistraction
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class DistractionQueue:
+    def __init__(self, batch_size: int, flush_interval_seconds: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_seconds
+        self.max_pending = max_pending
+        # (row, start time and owner of its sprint) in arrival order
+        self._pending: List[Tuple[dict, datetime, Optional[str]]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.flush_latency = Histogram(LATENCY_BUCKETS)
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.enqueued = 0
+        self.flushed = 0
+        self.flush_failures = 0
+        self.rejected = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task, then write everything still queued"""
+        if self._task is not None:
+            # Not cancelled: a batch being written is allowed to commit
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if self._pending:
+            try:
+                flushed = await self.flush()
+                logger.info(f"Flushed {flushed} queued distractions on shutdown")
+            except Exception as e:
+                logger.error(f"Failed to flush {self.depth} queued distractions on shutdown: {e}")
+
+    def enqueue(
+        self,
+        sprint_id: str,
+        sprint_start_time: datetime,
+        distraction: str,
+        owner_id: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Queue a distraction for the next batch and return its row, or None if it was not accepted"""
+        if not self.running:
+            return None
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            return None
+        row = {
+            "id": str(uuid.uuid4()),
+            "sprint_id": sprint_id,
+            "distraction": distraction,
+            "timestamp": datetime.now(),  # same clock as the sprint's start_time
+            "addressed": False,
+        }
+        self._pending.append((row, sprint_start_time, owner_id))
+        self.enqueued += 1
+        if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return row
+
+    async def flush(self) -> int:
+        """Write all pending distractions; a batch that fails goes back on the queue"""
+        flushed = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                started = time.perf_counter()
+                try:
+                    await self._write(batch)
+                except BaseException:
+                    self._pending[:0] = batch
+                    self.flush_failures += 1
+                    raise
+                self.flush_latency.observe(time.perf_counter() - started)
+                self.batch_sizes.observe(len(batch))
+                self.flushed += len(batch)
+                flushed += len(batch)
+        return flushed
+
+    async def _write(self, batch: List[Tuple[dict, datetime, Optional[str]]]):
+        # Rollup rows are per owner and start day (and its week), so one
+        # delta per owner and day
+        per_day: Dict[Tuple[Optional[str], date], Tuple[datetime, int]] = {}
+        for _, start_time, owner_id in batch:
+            key = (owner_id, start_time.date())
+            first_start, count = per_day.get(key, (start_time, 0))
+            per_day[key] = (first_start, count + 1)
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(SprintDistraction), [row for row, _, _ in batch])
+            for (owner_id, _), (start_time, count) in per_day.items():
+                await apply_rollup_delta(db, start_time, {"distractions": count}, owner_id)
+            await db.commit()
+
+    async def _run(self):
+        while not self._stopping:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            # Give the batch until the flush interval to fill up
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._pending) < self.batch_size and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Distraction flush failed, {self.depth} still queued: {e}")
+                await asyncio.sleep(self.flush_interval)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "depth": self.depth,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+            "rejected": self.rejected,
+            "flushes": self.flush_latency.count,
+            "avg_flush_ms": (self.flush_latency.sum / self.flush_latency.count * 1000)
+            if self.flush_latency.count else 0.0,
+            "avg_batch_size": (self.batch_sizes.sum / self.batch_sizes.count) if self.batch_sizes.count else 0.0,
+        }
+
+    def render_metrics(self) -> List[str]:
+        return [
+            "# HELP distraction_queue_depth Distractions accepted but not yet written",
+            "# TYPE distraction_queue_depth gauge",
+            f"distraction_queue_depth {self.depth}",
+            "# HELP distraction_queue_flushed_total Distractions written by the write-behind queue",
+            "# TYPE distraction_queue_flushed_total counter",
+            f"distraction_queue_flushed_total {self.flushed}",
+            "# HELP distraction_queue_flush_failures_total Batches that failed to write and were requeued",
+            "# TYPE distraction_queue_flush_failures_total counter",
+            f"distraction_queue_flush_failures_total {self.flush_failures}",
+            "# HELP distraction_queue_rejected_total Distractions written directly because the queue was full",
+            "# TYPE distraction_queue_rejected_total counter",
+            f"distraction_queue_rejected_total {self.rejected}",
+            "# HELP distraction_queue_flush_duration_seconds Time to write one batch",
+            "# TYPE distraction_queue_flush_duration_seconds histogram",
+            *self.flush_latency.render("distraction_queue_flush_duration_seconds", ""),
+            "# HELP distraction_queue_batch_size Distractions written per batch",
+            "# TYPE distraction_queue_batch_size histogram",
+            *self.batch_sizes.render("distraction_queue_batch_size", ""),
+        ]
+
+
+distraction_queue = DistractionQueue(
+    batch_size=settings.distraction_batch_size,
+    flush_interval_seconds=settings.distraction_flush_interval_seconds,
+    max_pending=settings.distraction_max_pending,
+)
+metrics.collectors.append(distraction_queue.render_metrics)
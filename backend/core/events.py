@@ -0,0 +1,71 @@
+"""
+In-process pub/sub for live sprint events
+
+Handlers publish events (sprint.started, sprint.distraction, ...) and each
+open Server-Sent Events stream holds a bounded subscriber queue. Events
+carry the owner of the sprint they describe and only reach subscribers
+of that same owner scope. A slow subscriber loses its oldest events
+rather than blocking publishers or growing memory without bound.
+"""
+
+import asyncio
+import itertools
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: Any
+    owner_id: Optional[str] = None
+
+    def to_sse(self) -> str:
+        """Render as a Server-Sent Events message"""
+        payload = json.dumps(jsonable_encoder(self.data))
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class EventBroker:
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        # queue -> owner scope it receives (None: the shared scope)
+        self._subscribers: Dict[asyncio.Queue, Optional[str]] = {}
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, owner_id: Optional[str] = None) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers[queue] = owner_id
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    def publish(self, event_type: str, data: Any, owner_id: Optional[str] = None) -> Event:
+        """Fan an event out to the owner's subscribers without awaiting"""
+        event = Event(id=next(self._ids), type=event_type, data=data, owner_id=owner_id)
+        self.published += 1
+        for queue, subscriber_owner in self._subscribers.items():
+            if subscriber_owner != owner_id:
+                continue
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+        return event
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+sprint_events = EventBroker()
@@ -0,0 +1,54 @@
+"""
+HTTP conditional GET helpers (ETag / If-None-Match)
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the current ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    media_type: str = "application/json",
+    cache_control: str = "no-cache",
+) -> Response:
+    """
+    Return 304 Not Modified when the client already has this ETag,
+    otherwise the full body. `no-cache` makes browsers revalidate on
+    every fetch, which the 304 path keeps cheap.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    return not_modified(request, etag, cache_control) or Response(content=body, media_type=media_type, headers=headers)
+
+
+def not_modified(request: Request, etag: str, cache_control: str = "no-cache") -> Optional[Response]:
+    """304 Not Modified if the client already has this ETag, else None"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
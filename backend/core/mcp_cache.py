@@ -0,0 +1,101 @@
+"""
+Result cache for idempotent MCP tool calls
+
+Opt-in per tool: only tools with a configured TTL are cached (exact name
+or fnmatch pattern such as "calendar.*"). Entries are keyed on a canonical
+hash of tool name + parameters, bounded by an LRU size limit, and
+concurrent identical calls share a single in-flight upstream request.
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class MCPResultCache:
+    """TTL + LRU cache with request coalescing"""
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 1000, enabled: bool = True):
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def make_key(tool_name: str, parameters: dict) -> str:
+        """Canonical hash: parameter order and whitespace don't matter"""
+        canonical = json.dumps(
+            {"tool": tool_name, "parameters": parameters},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def ttl_for(self, tool_name: str) -> Optional[float]:
+        """TTL in seconds for a tool, or None if it must not be cached"""
+        if tool_name in self.ttls:
+            return self.ttls[tool_name]
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(tool_name, pattern):
+                return ttl
+        return None
+
+    async def get_or_call(self, tool_name: str, parameters: dict, call: Callable[[], Awaitable[Any]]):
+        """Return a fresh cached result, join an identical in-flight call, or make the call"""
+        ttl = self.ttl_for(tool_name) if self.enabled else None
+        if not ttl or ttl <= 0:
+            return await call()
+
+        key = self.make_key(tool_name, parameters)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return result
+            del self._entries[key]
+            self.counters["expirations"] += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.counters["misses"] += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda finished: self._on_done(key, ttl, finished))
+        else:
+            self.counters["coalesced"] += 1
+        # Shielded so one caller cancelling doesn't cancel the shared call
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, ttl: float, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return  # errors are never cached
+        self._entries[key] = (time.monotonic() + ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"] + self.counters["coalesced"]
+        return {
+            **self.counters,
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "in_flight": len(self._inflight),
+            "hit_ratio": (self.counters["hits"] + self.counters["coalesced"]) / lookups if lookups else 0.0,
+            "ttls": self.ttls,
+        }
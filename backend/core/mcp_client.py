@@ -0,0 +1,294 @@
+"""
+Shared MCP server client
+
+One connection-pooled httpx.AsyncClient is created in the app lifespan and
+reused for every tool call, so calls skip TCP/TLS setup. Calls are bounded
+by a concurrency cap and guarded by a circuit breaker so a slow or failing
+MCP server sheds load quickly instead of piling up requests.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+from core.mcp_cache import MCPResultCache
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MCPClientError(Exception):
+    """Base error for MCP calls, carrying the HTTP status to surface"""
+
+    status_code = 502
+
+    def __init__(self, detail: str, status_code: Optional[int] = None):
+        super().__init__(detail)
+        self.detail = detail
+        if status_code is not None:
+            self.status_code = status_code
+
+
+class MCPCircuitOpenError(MCPClientError):
+    status_code = 503
+
+
+class MCPOverloadedError(MCPClientError):
+    status_code = 503
+
+
+class MCPTimeoutError(MCPClientError):
+    status_code = 504
+
+
+class MCPUpstreamError(MCPClientError):
+    """The MCP server answered with a non-200 status"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open probe"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream right now"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self):
+        """Free the half-open probe slot of a call that ended without an outcome (overload, cancellation)"""
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"MCP circuit breaker opened after {self.failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class MCPClient:
+    """Pooled, bounded client for the MCP server's /tool endpoint"""
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_token: Optional[str] = None,
+        timeout: float = 10.0,
+        connect_timeout: float = 2.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_concurrency: int = 20,
+        queue_timeout: float = 1.0,
+        max_retries: int = 1,
+        breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[MCPResultCache] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.auth_token = auth_token
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+        self.cache = cache or MCPResultCache(ttls={}, enabled=False)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.counters = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "rejected_open_circuit": 0,
+            "rejected_overloaded": 0,
+            "retries": 0,
+        }
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "MCPClient":
+        return cls(
+            base_url=settings.mcp_server_url,
+            auth_token=settings.mcp_auth_token,
+            timeout=settings.mcp_timeout_seconds,
+            connect_timeout=settings.mcp_connect_timeout_seconds,
+            max_connections=settings.mcp_max_connections,
+            max_keepalive_connections=settings.mcp_max_keepalive_connections,
+            keepalive_expiry=settings.mcp_keepalive_expiry_seconds,
+            http2=settings.mcp_http2,
+            max_concurrency=settings.mcp_max_concurrency,
+            queue_timeout=settings.mcp_queue_timeout_seconds,
+            max_retries=settings.mcp_max_retries,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.mcp_breaker_failure_threshold,
+                reset_timeout=settings.mcp_breaker_reset_seconds,
+            ),
+            cache=MCPResultCache(
+                ttls=settings.mcp_cache_ttls,
+                max_entries=settings.mcp_cache_max_entries,
+                enabled=settings.mcp_cache_enabled,
+            ),
+        )
+
+    async def start(self):
+        """Open the pooled HTTP client (called from the app lifespan)"""
+        if self._client is not None:
+            return
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("MCP_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+                http2 = False
+        headers = {"Authorization": f"Bearer {self.auth_token}"} if self.auth_token else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=http2,
+            headers=headers,
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def call_tool(self, tool_name: str, parameters: dict):
+        """Execute a tool on the MCP server and return its JSON result"""
+        return await self.cache.get_or_call(
+            tool_name, parameters, lambda: self._call_upstream(tool_name, parameters)
+        )
+
+    async def _call_upstream(self, tool_name: str, parameters: dict):
+        if self._client is None:
+            await self.start()
+        self.counters["calls"] += 1
+
+        # Queue for a slot first: a half-open probe must only be taken by a
+        # call that is about to go upstream
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.counters["rejected_overloaded"] += 1
+            raise MCPOverloadedError("Too many concurrent MCP calls")
+
+        try:
+            if not self.breaker.allow():
+                self.counters["rejected_open_circuit"] += 1
+                raise MCPCircuitOpenError("MCP server is unavailable (circuit open)")
+            probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+            self.in_flight += 1
+            started = time.perf_counter()
+            try:
+                response = await self._post_with_retry(tool_name, parameters)
+                if response.status_code >= 500:
+                    self._record_failure(started)
+                else:
+                    self._record_success(started)
+            except httpx.TimeoutException:
+                self._record_failure(started)
+                raise MCPTimeoutError("MCP tool call timed out")
+            except httpx.HTTPError as e:
+                self._record_failure(started)
+                raise MCPClientError(f"MCP server unreachable: {e}")
+            finally:
+                self.in_flight -= 1
+                # No-op once the outcome was recorded; frees the slot if the
+                # call was cancelled (e.g. /mcp/batch on client disconnect)
+                if probe:
+                    self.breaker.release_probe()
+        finally:
+            self._semaphore.release()
+
+        if response.status_code != 200:
+            raise MCPUpstreamError(
+                f"MCP tool execution failed: {response.text}",
+                status_code=response.status_code,
+            )
+        return response.json()
+
+    async def _post_with_retry(self, tool_name: str, parameters: dict) -> httpx.Response:
+        # Only connection failures are retried: the request never reached
+        # the server, so retrying cannot run a tool twice
+        attempt = 0
+        while True:
+            try:
+                return await self._client.post("/tool", json={"tool": tool_name, "parameters": parameters})
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.counters["retries"] += 1
+
+    def _record_success(self, started: float):
+        self.breaker.record_success()
+        self.counters["succeeded"] += 1
+        self._record_latency(started)
+
+    def _record_failure(self, started: float):
+        self.breaker.record_failure()
+        self.counters["failed"] += 1
+        self._record_latency(started)
+
+    def _record_latency(self, started: float):
+        elapsed = time.perf_counter() - started
+        metrics.observe_mcp_call(elapsed)
+        self._latency_total += elapsed
+        self._latency_max = max(self._latency_max, elapsed)
+
+    def stats(self) -> dict:
+        completed = self.counters["succeeded"] + self.counters["failed"]
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "latency_avg_ms": (self._latency_total / completed * 1000) if completed else 0.0,
+            "latency_max_ms": self._latency_max * 1000,
+            "cache": self.cache.stats(),
+        }
+
+
+# Global client instance, started and closed by the app lifespan
+mcp_client = MCPClient.from_settings()
@@ -0,0 +1,285 @@
+"""
+Request timing, per-route latency histograms and Prometheus exposition
+
+RequestMetricsMiddleware times every HTTP request and files it under its
+route template (/api/projects/{project_id}, not the raw path, so label
+cardinality stays bounded). Work done on behalf of the request is
+attributed through a context variable: SQLAlchemy cursor events on both
+engines add query count and time, and the MCP client adds upstream call
+time. Totals go to the /metrics endpoint in Prometheus text format and,
+per request, to a Server-Timing response header.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RequestTiming:
+    """Work attributed to the request in progress"""
+    scope: Optional[dict] = None
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    mcp_calls: int = 0
+    mcp_seconds: float = 0.0
+    # SQL text -> executions, only filled in while query inspection is on
+    statements: Optional[Dict[str, int]] = None
+
+
+_current_request: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar(
+    "current_request_timing", default=None
+)
+
+
+def current_request() -> Optional[RequestTiming]:
+    """Timing of the HTTP request this code runs for, if any"""
+    return _current_request.get()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        prefix = f"{labels}," if labels else ""
+        suffix = f"{{{labels}}}" if labels else ""
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = 0.0
+        self.mcp_calls = 0
+        self.mcp_seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.db_query_latency = Histogram(LATENCY_BUCKETS)
+        self.mcp_call_latency = Histogram(LATENCY_BUCKETS)
+        self.in_flight = 0
+        # Called with (method, route, status, seconds, timing) after each request
+        self.request_observers: List[Callable] = []
+        # Return extra exposition lines (HELP/TYPE included) for /metrics
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, timing: RequestTiming):
+        for observer in self.request_observers:
+            observer(method, route, status, seconds, timing)
+        with self._lock:
+            stats = self.routes.get((method, route))
+            if stats is None:
+                stats = self.routes[(method, route)] = RouteStats()
+            stats.latency.observe(seconds)
+            stats.db_queries.observe(timing.db_queries)
+            stats.db_seconds += timing.db_seconds
+            stats.mcp_calls += timing.mcp_calls
+            stats.mcp_seconds += timing.mcp_seconds
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def observe_query(self, seconds: float):
+        timing = _current_request.get()
+        if timing is not None:
+            timing.db_queries += 1
+            timing.db_seconds += seconds
+        with self._lock:
+            self.db_query_latency.observe(seconds)
+
+    def observe_mcp_call(self, seconds: float):
+        timing = _current_request.get()
+        if timing is not None:
+            timing.mcp_calls += 1
+            timing.mcp_seconds += seconds
+        with self._lock:
+            self.mcp_call_latency.observe(seconds)
+
+    def watch_engine(self, sync_engine):
+        """Time every cursor execution on an engine (async engines: pass .sync_engine)"""
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            self.observe_query(time.perf_counter() - conn.info["query_started"].pop())
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _handle_error(exception_context):
+            started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+            if started:
+                self.observe_query(time.perf_counter() - started.pop())
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            routes = sorted(self.routes.items())
+            lines += [
+                "# HELP http_requests_total HTTP requests by route template and status",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route), stats in routes:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f'http_requests_total{{method="{method}",route="{_label_value(route)}",status="{status}"}} {count}'
+                    )
+            lines += [
+                "# HELP http_request_duration_seconds Time to the last response byte",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), stats in routes:
+                lines += stats.latency.render(
+                    "http_request_duration_seconds", f'method="{method}",route="{_label_value(route)}"'
+                )
+            lines += [
+                "# HELP http_request_db_queries Database queries issued per request",
+                "# TYPE http_request_db_queries histogram",
+            ]
+            for (method, route), stats in routes:
+                lines += stats.db_queries.render(
+                    "http_request_db_queries", f'method="{method}",route="{_label_value(route)}"'
+                )
+            for name, attribute, kind, help_text in (
+                ("http_request_db_seconds_total", "db_seconds", "counter", "Database time spent serving requests"),
+                ("http_request_mcp_calls_total", "mcp_calls", "counter", "Upstream MCP calls made while serving requests"),
+                ("http_request_mcp_seconds_total", "mcp_seconds", "counter", "Upstream MCP time spent serving requests"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for (method, route), stats in routes:
+                    value = getattr(stats, attribute)
+                    lines.append(f'{name}{{method="{method}",route="{_label_value(route)}"}} {value:g}')
+            lines += [
+                "# HELP http_requests_in_flight Requests currently being served",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP db_query_duration_seconds Duration of each database query, requests and background work",
+                "# TYPE db_query_duration_seconds histogram",
+                *self.db_query_latency.render("db_query_duration_seconds", ""),
+                "# HELP mcp_call_duration_seconds Duration of each upstream MCP call",
+                "# TYPE mcp_call_duration_seconds histogram",
+                *self.mcp_call_latency.render("mcp_call_duration_seconds", ""),
+            ]
+        for collector in self.collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+            self.db_query_latency = Histogram(LATENCY_BUCKETS)
+            self.mcp_call_latency = Histogram(LATENCY_BUCKETS)
+
+
+metrics = MetricsRegistry()
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's path template including any router prefix. Newer
+    FastAPI versions keep included routes un-prefixed, so the prefix is
+    recovered as the part of the request path before the route's own match.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(path):
+        return template
+    for index, char in enumerate(path):
+        if char == "/" and index and regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+def _server_timing(elapsed: float, timing: RequestTiming) -> bytes:
+    parts = [f"app;dur={elapsed * 1000:.1f}"]
+    if timing.db_queries:
+        parts.append(f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.db_queries} queries"')
+    if timing.mcp_calls:
+        parts.append(f'mcp;dur={timing.mcp_seconds * 1000:.1f};desc="{timing.mcp_calls} calls"')
+    return ", ".join(parts).encode("latin-1")
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware (no per-request task, unlike BaseHTTPMiddleware).
+    Server-Timing covers the work done before the response headers are
+    sent; the histograms record the full time to the last body byte, which
+    for streaming responses includes the stream.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timing = RequestTiming(scope=scope)
+        token = _current_request.set(timing)
+        started = time.perf_counter()
+        status = 500
+        metrics.in_flight += 1
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(time.perf_counter() - started, timing)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            metrics.in_flight -= 1
+            _current_request.reset(token)
+            metrics.observe_request(
+                scope["method"],
+                route_template(scope),
+                status,
+                time.perf_counter() - started,
+                timing,
+            )
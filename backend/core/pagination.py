@@ -0,0 +1,56 @@
+"""
+Keyset (seek) pagination helpers
+
+A cursor is an opaque, URL-safe token holding the sort-key values of the
+last row on a page. The next page is fetched with a WHERE clause that
+seeks past those values, so every page costs O(page) regardless of how
+deep into the collection the client is.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of a row into an opaque cursor"""
+    payload = [
+        {"$dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, list) or len(payload) != expected_length:
+        raise ValueError("Invalid cursor")
+    return [
+        datetime.fromisoformat(value["$dt"]) if isinstance(value, dict) else value
+        for value in payload
+    ]
+
+
+def keyset_condition(columns: Sequence[Any], values: Sequence[Any], descending: Sequence[bool]):
+    """
+    Build the WHERE clause selecting rows strictly after `values` in the
+    ordering given by `columns` / `descending`.
+
+    Expanded as (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ... so each branch
+    can use a composite index on the sort columns.
+    """
+    clauses = []
+    for i, (column, value, desc) in enumerate(zip(columns, values, descending)):
+        prefix = [columns[j] == values[j] for j in range(i)]
+        step = column < value if desc else column > value
+        clauses.append(and_(*prefix, step))
+    return or_(*clauses)
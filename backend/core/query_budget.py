@@ -0,0 +1,107 @@
+"""
+Pytest plugin: fail tests that go over a declared database query budget
+
+Enable it from a conftest.py with `pytest_plugins = ["core.query_budget"]`
+(or `pytest -p core.query_budget`). Every HTTP request served while a test
+runs is checked against ENDPOINT_QUERY_BUDGETS, keyed by method and route
+template; tests can tighten or add budgets, or cap a block of code:
+
+    def test_sprint_history(client, query_budget):
+        query_budget.endpoint("GET /api/assistant/sprint/all", 2)
+        with query_budget(4):
+            client.get("/api/assistant/sprint/all")
+            client.get("/api/assistant/sprint/all?limit=10")
+
+    @pytest.mark.query_budget({"GET /api/projects/": 1})
+    def test_project_list(client):
+        client.get("/api/projects/?status=active")
+
+Queries are counted by the request metrics hooks in core.metrics, so
+whatever the app runs on behalf of a request (lazy loads included) counts.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, List
+
+import pytest
+
+from core.metrics import metrics
+
+# Queries per request for the hot endpoints. Keep these at what the code
+# needs today so a new lazy load or per-row query fails the suite.
+ENDPOINT_QUERY_BUDGETS: Dict[str, int] = {
+    "GET /api/projects/": 1,
+    "GET /api/projects/{project_id}": 1,
+    "GET /api/assistant/sprint/active": 2,  # sprint + selectin distractions
+    "GET /api/assistant/sprint/all": 2,  # page + selectin distractions
+    "GET /api/assistant/sprint/stats": 1,
+    "GET /api/assistant/rituals/morning": 1,
+    "GET /api/assistant/rituals/evening": 1,
+    "GET /api/search/": 1,
+    "GET /api/auth/me": 1,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    def __init__(self, budgets: Dict[str, int]):
+        self.budgets = dict(budgets)
+        self.violations: List[str] = []
+
+    def endpoint(self, route: str, max_queries: int):
+        """Declare the budget for one endpoint, e.g. ("GET /api/projects/", 1)"""
+        self.budgets[route] = max_queries
+
+    @contextmanager
+    def __call__(self, max_queries: int):
+        """Cap the queries run inside the block, by the app or the test itself"""
+        before = metrics.db_query_latency.count
+        yield
+        used = metrics.db_query_latency.count - before
+        if used > max_queries:
+            raise QueryBudgetExceeded(f"Block ran {used} queries, budget is {max_queries}")
+
+    def observe(self, method: str, route: str, status: int, seconds: float, timing):
+        key = f"{method} {route}"
+        budget = self.budgets.get(key)
+        if budget is not None and timing.db_queries > budget:
+            self.violations.append(f"{key} ran {timing.db_queries} queries, budget is {budget}")
+
+    def verify(self):
+        if self.violations:
+            raise QueryBudgetExceeded("Query budget exceeded:\n  " + "\n  ".join(self.violations))
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(budgets): per-endpoint query budgets, {'GET /route/template': max_queries}"
+    )
+
+
+@pytest.fixture(autouse=True)
+def query_budget(request):
+    budget = QueryBudget(ENDPOINT_QUERY_BUDGETS)
+    # Closest marker last, so a function marker overrides a class or module one
+    for marker in reversed(list(request.node.iter_markers("query_budget"))):
+        for route, max_queries in (marker.args[0] if marker.args else marker.kwargs).items():
+            budget.endpoint(route, max_queries)
+    request.node.query_budget = budget
+    metrics.request_observers.append(budget.observe)
+    try:
+        yield budget
+    finally:
+        metrics.request_observers.remove(budget.observe)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    # Checked here rather than in fixture teardown so an overrun is
+    # reported as a test failure, not an error
+    result = yield
+    budget = getattr(item, "query_budget", None)
+    if budget is not None:
+        budget.verify()
+    return result
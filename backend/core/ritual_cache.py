@@ -0,0 +1,61 @@
+"""
+In-process cache of serialized ritual checklists
+
+Entries hold the JSON body and ETag for each (owner, ritual name). Any committed write
+to Ritual or RitualStep bumps the cache version and drops all entries;
+readers only store a result if the version didn't change while they were
+querying, so a read racing a write can never cache stale data.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import Ritual, RitualStep
+
+
+class RitualCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Optional[str], str], Tuple[bytes, str]] = {}
+        self.version = 0
+
+    def get(self, key: Tuple[Optional[str], str]) -> Optional[Tuple[bytes, str]]:
+        return self._entries.get(key)
+
+    def put(self, key: Tuple[Optional[str], str], version: int, body: bytes, etag: str):
+        with self._lock:
+            if version == self.version:
+                self._entries[key] = (body, etag)
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+ritual_cache = RitualCache()
+
+
+def _mark_rituals_dirty(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["rituals_dirty"] = True
+    # Also drop entries right away so this process never serves the old
+    # checklist once the write is flushed
+    ritual_cache.invalidate()
+
+
+def _invalidate_after_commit(session):
+    if session.info.pop("rituals_dirty", False):
+        ritual_cache.invalidate()
+
+
+for _model in (Ritual, RitualStep):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_rituals_dirty)
+
+event.listen(Session, "after_commit", _invalidate_after_commit)
+event.listen(Session, "after_rollback", lambda session: session.info.pop("rituals_dirty", None))
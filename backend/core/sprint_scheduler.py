@@ -0,0 +1,187 @@
+"""
+Server-side sprint timer
+
+Keeps a min-heap of upcoming nudge and expiry deadlines for active
+sprints and sleeps until the earliest one, so firing is O(log n) and
+nothing polls the database. Cancelled or rescheduled sprints are dropped
+lazily: every heap entry carries the sprint's schedule generation and
+stale entries are skipped when popped. The heap is rebuilt from the
+sprints table on startup.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.events import EventBroker, sprint_events
+from core.sprint_stats import apply_rollup_delta
+from models import Sprint
+
+logger = logging.getLogger(__name__)
+
+NUDGE = "nudge"
+EXPIRE = "expire"
+
+
+class SprintScheduler:
+    def __init__(self, broker: EventBroker, nudge_interval_minutes: float, expiry_grace_minutes: float = 0.0):
+        self.broker = broker
+        self.nudge_interval = timedelta(minutes=nudge_interval_minutes)
+        self.expiry_grace = timedelta(minutes=expiry_grace_minutes)
+        # (deadline timestamp, tiebreak, sprint_id, generation, kind, payload)
+        self._heap: List[Tuple[float, int, str, int, str, dict]] = []
+        self._generations: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.fired = {NUDGE: 0, EXPIRE: 0}
+
+    async def start(self):
+        """Rebuild the schedule from the database and start the timer task"""
+        await self.rebuild()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def rebuild(self):
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Sprint.id, Sprint.task, Sprint.start_time, Sprint.end_time, Sprint.owner_id)
+                .filter(Sprint.status == "active")
+            )
+            rows = result.all()
+        self._heap.clear()
+        self._generations.clear()
+        for sprint_id, task, start_time, end_time, owner_id in rows:
+            self.schedule_sprint(sprint_id, task, start_time, end_time, owner_id)
+        logger.info(f"Sprint scheduler tracking {len(rows)} active sprints")
+
+    def schedule_sprint(
+        self,
+        sprint_id: str,
+        task: str,
+        start_time: datetime,
+        end_time: Optional[datetime],
+        owner_id: Optional[str] = None,
+    ):
+        """(Re)schedule nudges and expiry for an active sprint"""
+        if start_time is None or end_time is None:
+            return
+        generation = self._generations.get(sprint_id, 0) + 1
+        self._generations[sprint_id] = generation
+        now = datetime.now()
+
+        if self.nudge_interval.total_seconds() > 0:
+            nudge_at = start_time + self.nudge_interval
+            while nudge_at < end_time:
+                if nudge_at > now:
+                    elapsed = int((nudge_at - start_time).total_seconds() // 60)
+                    self._push(nudge_at, sprint_id, generation, NUDGE, {
+                        "task": task,
+                        "message": f"{elapsed}-minute nudge",
+                        "end_time": end_time,
+                        "owner_id": owner_id,
+                    })
+                nudge_at += self.nudge_interval
+
+        self._push(end_time + self.expiry_grace, sprint_id, generation, EXPIRE, {
+            "task": task,
+            "end_time": end_time,
+            "owner_id": owner_id,
+        })
+        self._wakeup.set()
+
+    def cancel_sprint(self, sprint_id: str):
+        """Forget a sprint; its heap entries become stale and are skipped"""
+        self._generations.pop(sprint_id, None)
+
+    def _push(self, when: datetime, sprint_id: str, generation: int, kind: str, payload: dict):
+        heapq.heappush(self._heap, (when.timestamp(), next(self._counter), sprint_id, generation, kind, payload))
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - datetime.now().timestamp()
+            if delay > 0:
+                try:
+                    # Woken early when a sooner deadline is scheduled
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, sprint_id, generation, kind, payload = heapq.heappop(self._heap)
+            if self._generations.get(sprint_id) != generation:
+                continue
+            try:
+                if kind == NUDGE:
+                    self._fire_nudge(sprint_id, payload)
+                else:
+                    await self._fire_expiry(sprint_id, payload)
+            except Exception as e:
+                logger.error(f"Sprint scheduler failed to fire {kind} for {sprint_id}: {e}")
+
+    def _fire_nudge(self, sprint_id: str, payload: dict):
+        now = datetime.now()
+        self.fired[NUDGE] += 1
+        self.broker.publish("sprint.nudge", {
+            "sprint_id": sprint_id,
+            "nudge_time": now,
+            "message": payload["message"],
+            "task": payload["task"],
+            "remaining_minutes": max(0, (payload["end_time"] - now).total_seconds() / 60),
+        }, payload["owner_id"])
+
+    async def _fire_expiry(self, sprint_id: str, payload: dict):
+        self.cancel_sprint(sprint_id)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Sprint)
+                .where(Sprint.id == sprint_id, Sprint.status == "active")
+                .values(status="expired", actual_end_time=payload["end_time"], updated_at=datetime.now())
+            )
+            if result.rowcount:
+                sprint = await db.get(Sprint, sprint_id)
+                await apply_rollup_delta(db, sprint.start_time, {"sprints_expired": 1}, sprint.owner_id)
+            await db.commit()
+        if result.rowcount:
+            self.fired[EXPIRE] += 1
+            self.broker.publish("sprint.expired", {
+                "sprint_id": sprint_id,
+                "task": payload["task"],
+                "status": "expired",
+                "end_time": payload["end_time"],
+            }, payload["owner_id"])
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "tracked_sprints": len(self._generations),
+            "pending_deadlines": len(self._heap),
+            "nudges_fired": self.fired[NUDGE],
+            "sprints_expired": self.fired[EXPIRE],
+        }
+
+
+sprint_scheduler = SprintScheduler(
+    sprint_events,
+    nudge_interval_minutes=settings.sprint_nudge_interval_minutes,
+    expiry_grace_minutes=settings.sprint_expiry_grace_minutes,
+)
@@ -0,0 +1,163 @@
+"""
+Incremental sprint statistics
+
+Every sprint write (start, distraction, complete, expiry) applies a delta
+to the sprint_rollups rows of the sprint's owner for its start day and ISO
+week in the same transaction, so reading stats costs one indexed range
+read no matter how much history there is.
+
+A sprint's contribution is derived from its current state; a status
+change applies (after - before), which keeps re-completions and late
+completions of expired sprints consistent with a full recompute.
+
+Rebuild the rollups from the sprints table with:
+
+    python -m core.sprint_stats
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, delete
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Sprint, SprintDistraction, SprintRollup
+
+# sprint_rollups.owner_id for the shared scope (sprints with no owner)
+SHARED_OWNER = ""
+
+COUNTERS = (
+    "sprints_started",
+    "sprints_completed",
+    "sprints_expired",
+    "sprints_overran",
+    "planned_minutes",
+    "focus_minutes",
+    "overrun_minutes",
+    "distractions",
+)
+
+
+def rollup_owner(owner_id: Optional[str]) -> str:
+    """The sprint_rollups.owner_id for a request or sprint owner"""
+    return SHARED_OWNER if owner_id is None else owner_id
+
+
+def period_keys(moment: datetime) -> List[Tuple[str, date]]:
+    """The (period, period_start) rollup rows a sprint started at `moment` belongs to"""
+    day = moment.date()
+    return [("day", day), ("week", day - timedelta(days=day.weekday()))]
+
+
+def sprint_contribution(
+    status: Optional[str],
+    start_time: datetime,
+    actual_end_time: Optional[datetime],
+    duration_minutes: int,
+) -> Dict[str, float]:
+    """Counters a sprint in the given state adds to its rollup rows"""
+    contribution = {"sprints_started": 1, "planned_minutes": float(duration_minutes)}
+    if status == "expired":
+        contribution["sprints_expired"] = 1
+    elif status == "completed" and actual_end_time is not None:
+        actual = max(0.0, (actual_end_time - start_time).total_seconds() / 60)
+        contribution["sprints_completed"] = 1
+        contribution["focus_minutes"] = actual
+        contribution["overrun_minutes"] = actual - duration_minutes
+        contribution["sprints_overran"] = 1 if actual > duration_minutes else 0
+    return contribution
+
+
+def contribution_of(sprint: Sprint) -> Dict[str, float]:
+    return sprint_contribution(sprint.status, sprint.start_time, sprint.actual_end_time, sprint.duration_minutes)
+
+
+def difference(after: Dict[str, float], before: Dict[str, float]) -> Dict[str, float]:
+    return {key: after.get(key, 0) - before.get(key, 0) for key in set(after) | set(before)}
+
+
+def _upsert_statement(dialect_name: str, deltas: Dict[str, float]):
+    """INSERT the deltas, or add them to the existing rollup row"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = SprintRollup.__table__
+    stmt = insert(table)
+    set_ = {column: table.c[column] + stmt.excluded[column] for column in deltas}
+    set_["updated_at"] = stmt.excluded.updated_at
+    return stmt.on_conflict_do_update(index_elements=["owner_id", "period", "period_start"], set_=set_)
+
+
+async def apply_rollup_delta(
+    db: AsyncSession,
+    start_time: datetime,
+    deltas: Dict[str, float],
+    owner_id: Optional[str],
+) -> None:
+    """Add deltas to the day and week rows of a sprint owned by `owner_id`; the caller commits"""
+    deltas = {key: value for key, value in deltas.items() if value}
+    if not deltas:
+        return
+    statement = _upsert_statement(db.bind.dialect.name, deltas)
+    now = datetime.utcnow()
+    rows = [
+        {
+            **{column: 0 for column in COUNTERS},
+            **deltas,
+            "owner_id": rollup_owner(owner_id),
+            "period": period,
+            "period_start": period_start,
+            "updated_at": now,
+        }
+        for period, period_start in period_keys(start_time)
+    ]
+    await db.execute(statement, rows)
+
+
+def backfill_rollups(connection: Connection) -> int:
+    """Rebuild every rollup row from the sprints table, returning the row count"""
+    totals: Dict[Tuple[str, str, date], Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    sprints = connection.execution_options(stream_results=True).execute(
+        select(Sprint.owner_id, Sprint.status, Sprint.start_time, Sprint.actual_end_time, Sprint.duration_minutes)
+        .where(Sprint.start_time.is_not(None))
+    )
+    for owner_id, status, start_time, actual_end_time, duration_minutes in sprints:
+        contribution = sprint_contribution(status, start_time, actual_end_time, duration_minutes)
+        for key in period_keys(start_time):
+            row = totals[(rollup_owner(owner_id), *key)]
+            for column, value in contribution.items():
+                row[column] += value
+
+    distractions = connection.execute(
+        select(Sprint.owner_id, Sprint.start_time, func.count(SprintDistraction.id))
+        .join(SprintDistraction, SprintDistraction.sprint_id == Sprint.id)
+        .where(Sprint.start_time.is_not(None))
+        .group_by(Sprint.id, Sprint.owner_id, Sprint.start_time)
+    )
+    for owner_id, start_time, count in distractions:
+        for key in period_keys(start_time):
+            totals[(rollup_owner(owner_id), *key)]["distractions"] += count
+
+    now = datetime.utcnow()
+    connection.execute(delete(SprintRollup))
+    if totals:
+        connection.execute(
+            SprintRollup.__table__.insert(),
+            [
+                {"owner_id": owner_id, "period": period, "period_start": period_start, "updated_at": now, **counters}
+                for (owner_id, period, period_start), counters in totals.items()
+            ]
+        )
+    return len(totals)
+
+
+if __name__ == "__main__":
+    from core.database import engine
+
+    with engine.begin() as connection:
+        rows = backfill_rollups(connection)
+    print(f"Rebuilt {rows} sprint rollup rows")
@@ -31,13 +31,12 @@ def main():
         print("📁 Database file location:", os.path.abspath("ai_assistant.db"))
         
         # Verify data was added
-        from core.database import get_db_session
+        from core.database import session_scope
         from models import Project, Ritual
         
-        db = get_db_session()
-        project_count = db.query(Project).count()
-        ritual_count = db.query(Ritual).count()
-        db.close()
+        with session_scope() as db:
+            project_count = db.query(Project).count()
+            ritual_count = db.query(Ritual).count()
         
         print(f"📊 Data verification:")
         print(f"   - Projects: {project_count}")
@@ -5,10 +5,19 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import uvicorn
 import os
+import sys
+import platform
 import logging
-from api.routes import assistant, auth, projects
+from datetime import datetime
+from api.routes import assistant, auth, projects, search
 from core.config import settings, is_production
-from core.database import init_db
+from core.database import init_db, async_engine, pool_stats, query_inspector
+from core.metrics import metrics, RequestMetricsMiddleware
+from core.compression import CompressionMiddleware
+from core.mcp_client import mcp_client
+from core.build_info import build_info
+from core.sprint_scheduler import sprint_scheduler
+from core.distraction_queue import distraction_queue
 from models import Sprint, SprintDistraction, Project, Ritual, RitualStep
 from utils.seed_data import seed_all_data
 
@@ -32,10 +41,19 @@ async def lifespan(app: FastAPI):
         logger.info("Initial data seeding completed")
     except Exception as e:
         logger.error(f"Data seeding failed: {e}")
+
+    await mcp_client.start()
+    await sprint_scheduler.start()
+    if settings.distraction_write_behind:
+        await distraction_queue.start()
     yield
     # Shutdown
     logger.info("Shutting down AI Personal Assistant...")
-    pass
+    # Before the engine is disposed, so queued distractions are written
+    await distraction_queue.stop()
+    await sprint_scheduler.stop()
+    await mcp_client.close()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -81,27 +99,35 @@ app.add_middleware(
 
 logger.info("CORS middleware configured successfully")
 
+if settings.response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        compresslevel=settings.gzip_compresslevel,
+        brotli_quality=settings.brotli_quality,
+    )
+
+# Outermost, so request timing includes the CORS layer
+app.add_middleware(RequestMetricsMiddleware, server_timing=settings.server_timing_header)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(assistant.router, prefix="/api/assistant", tags=["assistant"])
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+
+# platform.platform() re-inspects the interpreter binary on each call, so resolve it once
+PLATFORM = platform.platform()
+
 
 @app.get("/")
 async def root():
     logger.info("Root endpoint accessed")
-    # Get current git revision
-    try:
-        import subprocess
-        git_rev = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], 
-                                        stderr=subprocess.DEVNULL).decode().strip()
-    except:
-        git_rev = "unknown"
-    
     return {
         "message": "AI Personal Assistant API", 
         "version": "0.1.0", 
-        "build": f"{git_rev}-v4",
-        "deploy_time": __import__('datetime').datetime.now().isoformat()
+        "build": build_info.build_version,
+        "deploy_time": build_info.started_at
     }
 
 @app.get("/health")
@@ -109,22 +135,26 @@ async def health_check():
     logger.info("Health check endpoint accessed")
     return {"status": "healthy", "service": "AI Personal Assistant"}
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Per-route latency, DB and MCP time in the Prometheus text format"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/db")
+async def db_pool_metrics():
+    """Connection pool and session lifecycle statistics"""
+    return pool_stats.snapshot()
+
+@app.get("/debug/queries")
+async def debug_queries():
+    """Recent slow queries and suspected N+1 patterns (dev/test query inspection)"""
+    return query_inspector.report()
+
 @app.get("/debug/cors")
 async def debug_cors():
     """Debug endpoint to check CORS configuration"""
     logger.info("CORS debug endpoint accessed")
     
-    # Get git revision info
-    import subprocess
-    try:
-        git_rev = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], 
-                                        stderr=subprocess.DEVNULL).decode().strip()
-        git_branch = subprocess.check_output(['git', 'branch', '--show-current'], 
-                                           stderr=subprocess.DEVNULL).decode().strip()
-    except:
-        git_rev = "unknown"
-        git_branch = "unknown"
-    
     # Categorize environment variables
     production_indicators = {
         "RENDER_SERVICE_NAME": os.getenv("RENDER_SERVICE_NAME"),
@@ -149,10 +179,11 @@ async def debug_cors():
     
     return {
         "deployment_info": {
-            "git_revision": git_rev,
-            "git_branch": git_branch,
-            "build_version": "b34eb02-v3",  # Update this with each deploy
-            "timestamp": __import__('datetime').datetime.now().isoformat()
+            "git_revision": build_info.git_revision,
+            "git_branch": build_info.git_branch,
+            "build_version": build_info.build_version,
+            "built_at": build_info.built_at,
+            "timestamp": datetime.now().isoformat()
         },
         "environment_analysis": {
             "is_production": is_production(),
@@ -167,8 +198,8 @@ async def debug_cors():
             "headers": ["*"]
         },
         "system_info": {
-            "python_version": __import__('sys').version,
-            "platform": __import__('platform').platform(),
+            "python_version": sys.version,
+            "platform": PLATFORM,
             "working_directory": os.getcwd()
         }
     }
@@ -217,7 +248,7 @@ async def test_cors():
     return {
         "status": "success",
         "message": "CORS is working correctly",
-        "timestamp": os.popen('date').read().strip(),
+        "timestamp": datetime.now().astimezone().strftime("%a %b %d %H:%M:%S %Z %Y"),
         "backend_url": "https://ai-personal-assistant-9xpq.onrender.com"
     }
 
@@ -0,0 +1,53 @@
+"""
+Alembic environment
+
+Migrations run against the app's own engine (core.database.engine) so
+they always target the same database the API uses. The app applies them
+on startup through core.database.run_migrations().
+"""
+
+from alembic import context
+
+from core.database import Base, engine
+import models  # noqa: F401  (register all tables on Base.metadata)
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit migration SQL without a database connection"""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations on a live connection"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_on(connection)
+        return
+    with engine.connect() as connection:
+        _run_on(connection)
+
+
+def _run_on(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,37 @@
+"""Indexes for the hot sprint, distraction, project and ritual filters
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Tables were historically created by Base.metadata.create_all, so this
+first revision only adds indexes and uses IF NOT EXISTS to stay a no-op
+on databases that create_all already built with them.
+"""
+
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_sprints_status_created_at", "sprints", ["status", "created_at"]),
+    ("ix_sprints_created_at_id", "sprints", ["created_at", "id"]),
+    ("ix_sprint_distractions_sprint_id", "sprint_distractions", ["sprint_id"]),
+    ("ix_projects_priority", "projects", ["priority"]),
+    ("ix_projects_status", "projects", ["status"]),
+    ("ix_ritual_steps_ritual_id", "ritual_steps", ["ritual_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,46 @@
+"""Composite indexes for the filtered, sorted project query API
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+The single-column status/priority indexes from 0001 are replaced by
+(column, created_at, id) composites, which serve the same equality
+filters and also the default keyset ordering.
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_projects_created_at_id", ["created_at", "id"]),
+    ("ix_projects_updated_at_id", ["updated_at", "id"]),
+    ("ix_projects_status_created_at", ["status", "created_at", "id"]),
+    ("ix_projects_priority_created_at", ["priority", "created_at", "id"]),
+    ("ix_projects_category_created_at", ["category", "created_at", "id"]),
+    ("ix_projects_due_date", ["due_date"]),
+]
+
+REPLACED = [
+    ("ix_projects_priority", ["priority"]),
+    ("ix_projects_status", ["status"]),
+]
+
+
+def upgrade():
+    for name, columns in INDEXES:
+        op.create_index(name, "projects", columns, if_not_exists=True)
+    for name, _ in REPLACED:
+        op.drop_index(name, table_name="projects", if_exists=True)
+
+
+def downgrade():
+    for name, columns in REPLACED:
+        op.create_index(name, "projects", columns, if_not_exists=True)
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="projects", if_exists=True)
@@ -0,0 +1,128 @@
+"""Full-text search index over projects, sprints and distractions (SQLite FTS5)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+One FTS5 table per kind (search_project, search_sprint,
+search_distraction) so a kind filter only ever touches its own index.
+search_docs maps (kind, ref_id) to the INTEGER PRIMARY KEY used as the
+FTS rowid, so updates and deletes touch exactly one index row. Every
+write allocates a fresh doc id, which keeps rowid order equal to write
+order: "most recent" searches walk an index backwards and stop after one
+page instead of sorting every match. Triggers on the source tables keep
+the indexes in sync for every write path (ORM routes, bulk upserts, the
+sprint scheduler).
+
+Skipped on databases other than SQLite, or SQLite builds without FTS5;
+/api/search reports 503 in that case.
+"""
+
+import logging
+
+from alembic import op
+from sqlalchemy.exc import OperationalError
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(__name__)
+
+# kind, source table, parent id, occurred_at, title, body
+SOURCES = [
+    (
+        "project", "projects", "NULL", "{row}.updated_at", "{row}.title",
+        "coalesce({row}.category, '') || ' ' || coalesce({row}.description, '') || ' ' || coalesce({row}.notes, '')",
+    ),
+    (
+        "sprint", "sprints", "NULL", "{row}.start_time", "{row}.task",
+        "coalesce({row}.description, '') || ' ' || coalesce({row}.retrospective, '')",
+    ),
+    (
+        "distraction", "sprint_distractions", "{row}.sprint_id", "{row}.timestamp", "{row}.distraction", "''",
+    ),
+]
+
+
+def _doc_id(kind: str, row: str) -> str:
+    return f"(SELECT id FROM search_docs WHERE kind = '{kind}' AND ref_id = {row}.id)"
+
+
+def _index_row(kind: str, parent: str, occurred: str, title: str, body: str, row: str) -> str:
+    values = ", ".join(expr.format(row=row) for expr in (parent, occurred, title, body))
+    return (
+        f"INSERT INTO search_{kind} (rowid, ref_id, parent_id, occurred_at, title, body) "
+        f"VALUES ({_doc_id(kind, row)}, {row}.id, {values});"
+    )
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    try:
+        for kind, *_ in SOURCES:
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS search_{kind} USING fts5("
+                "ref_id UNINDEXED, parent_id UNINDEXED, occurred_at UNINDEXED, "
+                "title, body, tokenize = 'porter unicode61')"
+            )
+    except OperationalError as e:
+        logger.warning(f"Full-text search disabled, FTS5 unavailable: {e}")
+        return
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS search_docs ("
+        "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, ref_id TEXT NOT NULL, UNIQUE (kind, ref_id))"
+    )
+
+    for kind, table, parent, occurred, title, body in SOURCES:
+        op.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+                INSERT OR IGNORE INTO search_docs (kind, ref_id) VALUES ('{kind}', new.id);
+                {_index_row(kind, parent, occurred, title, body, "new")}
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE ON {table} BEGIN
+                DELETE FROM search_{kind} WHERE rowid = {_doc_id(kind, "old")};
+                DELETE FROM search_docs WHERE kind = '{kind}' AND ref_id = old.id;
+                INSERT INTO search_docs (kind, ref_id) VALUES ('{kind}', new.id);
+                {_index_row(kind, parent, occurred, title, body, "new")}
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_{kind} WHERE rowid = {_doc_id(kind, "old")};
+                DELETE FROM search_docs WHERE kind = '{kind}' AND ref_id = old.id;
+            END
+        """)
+
+    # Backfill rows written before the triggers existed, oldest first across
+    # all kinds so doc ids follow time order
+    pending = " UNION ALL ".join(
+        f"SELECT '{kind}' AS kind, src.id AS ref_id, {occurred.format(row='src')} AS occurred_at "
+        f"FROM {table} AS src"
+        for kind, table, parent, occurred, title, body in SOURCES
+    )
+    op.execute(
+        "INSERT OR IGNORE INTO search_docs (kind, ref_id) "
+        f"SELECT kind, ref_id FROM ({pending}) ORDER BY occurred_at"
+    )
+    for kind, table, parent, occurred, title, body in SOURCES:
+        values = ", ".join(expr.format(row="src") for expr in (parent, occurred, title, body))
+        op.execute(
+            f"INSERT INTO search_{kind} (rowid, ref_id, parent_id, occurred_at, title, body) "
+            f"SELECT d.id, src.id, {values} FROM {table} AS src "
+            f"JOIN search_docs AS d ON d.kind = '{kind}' AND d.ref_id = src.id "
+            f"WHERE d.id NOT IN (SELECT rowid FROM search_{kind})"
+        )
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for kind, table, *_ in SOURCES:
+        for suffix in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS search_{kind}")
+    op.execute("DROP TABLE IF EXISTS search_docs")
@@ -0,0 +1,126 @@
+"""Daily and weekly sprint statistics rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Creates sprint_rollups (normally already built by create_all) and fills
+it from existing sprint history. The current rollups can be rebuilt at
+any time with `python -m core.sprint_stats`.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the schema and backfill as of this revision; later
+# model changes must not alter what this migration does
+COUNTERS = (
+    "sprints_started",
+    "sprints_completed",
+    "sprints_expired",
+    "sprints_overran",
+    "planned_minutes",
+    "focus_minutes",
+    "overrun_minutes",
+    "distractions",
+)
+
+sprints = sa.table(
+    "sprints",
+    sa.column("id", sa.String),
+    sa.column("status", sa.String),
+    sa.column("start_time", sa.DateTime),
+    sa.column("actual_end_time", sa.DateTime),
+    sa.column("duration_minutes", sa.Integer),
+)
+sprint_distractions = sa.table("sprint_distractions", sa.column("id", sa.String), sa.column("sprint_id", sa.String))
+
+
+def _rollups_table():
+    return sa.table(
+        "sprint_rollups",
+        sa.column("period", sa.String),
+        sa.column("period_start", sa.Date),
+        sa.column("updated_at", sa.DateTime),
+        *(sa.column(name) for name in COUNTERS),
+    )
+
+
+def _period_keys(moment):
+    day = moment.date()
+    return [("day", day), ("week", day - timedelta(days=day.weekday()))]
+
+
+def _contribution(status, start_time, actual_end_time, duration_minutes):
+    contribution = {"sprints_started": 1, "planned_minutes": float(duration_minutes)}
+    if status == "expired":
+        contribution["sprints_expired"] = 1
+    elif status == "completed" and actual_end_time is not None:
+        actual = max(0.0, (actual_end_time - start_time).total_seconds() / 60)
+        contribution["sprints_completed"] = 1
+        contribution["focus_minutes"] = actual
+        contribution["overrun_minutes"] = actual - duration_minutes
+        contribution["sprints_overran"] = 1 if actual > duration_minutes else 0
+    return contribution
+
+
+def backfill(connection):
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    rows = connection.execute(
+        sa.select(sprints.c.status, sprints.c.start_time, sprints.c.actual_end_time, sprints.c.duration_minutes)
+        .where(sprints.c.start_time.is_not(None))
+    )
+    for status, start_time, actual_end_time, duration_minutes in rows:
+        for key in _period_keys(start_time):
+            for column, value in _contribution(status, start_time, actual_end_time, duration_minutes).items():
+                totals[key][column] += value
+    counts = connection.execute(
+        sa.select(sprints.c.start_time, sa.func.count(sprint_distractions.c.id))
+        .join(sprint_distractions, sprint_distractions.c.sprint_id == sprints.c.id)
+        .where(sprints.c.start_time.is_not(None))
+        .group_by(sprints.c.id, sprints.c.start_time)
+    )
+    for start_time, count in counts:
+        for key in _period_keys(start_time):
+            totals[key]["distractions"] += count
+
+    rollups = _rollups_table()
+    now = datetime.utcnow()
+    connection.execute(rollups.delete())
+    if totals:
+        connection.execute(rollups.insert(), [
+            {"period": period, "period_start": period_start, "updated_at": now, **counters}
+            for (period, period_start), counters in totals.items()
+        ])
+
+
+def upgrade():
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if not inspector.has_table("sprint_rollups"):
+        op.create_table(
+            "sprint_rollups",
+            sa.Column("period", sa.String(), primary_key=True),
+            sa.Column("period_start", sa.Date(), primary_key=True),
+            *(
+                sa.Column(name, sa.Float() if name.endswith("_minutes") else sa.Integer(), nullable=False)
+                for name in COUNTERS
+            ),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+    elif "owner_id" in {column["name"] for column in inspector.get_columns("sprint_rollups")}:
+        # Built by create_all in a later shape; 0007 rebuilds and fills it
+        return
+    backfill(connection)
+
+
+def downgrade():
+    op.drop_table("sprint_rollups")
@@ -0,0 +1,85 @@
+"""Users table and per-user ownership of projects, sprints and rituals
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Adds users (normally already built by create_all) and a nullable
+owner_id on projects, sprints and rituals. Existing rows keep a NULL
+owner, which is the shared/anonymous scope. The list indexes from 0001
+and 0002 are replaced by versions leading with owner_id so per-user
+queries stay index range scans.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+OWNED_TABLES = ["projects", "sprints", "rituals"]
+
+INDEXES = [
+    ("ix_projects_owner_created_at_id", "projects", ["owner_id", "created_at", "id"]),
+    ("ix_projects_owner_updated_at_id", "projects", ["owner_id", "updated_at", "id"]),
+    ("ix_projects_owner_status_created_at", "projects", ["owner_id", "status", "created_at", "id"]),
+    ("ix_projects_owner_priority_created_at", "projects", ["owner_id", "priority", "created_at", "id"]),
+    ("ix_projects_owner_category_created_at", "projects", ["owner_id", "category", "created_at", "id"]),
+    ("ix_projects_owner_due_date", "projects", ["owner_id", "due_date"]),
+    ("ix_sprints_owner_status_created_at", "sprints", ["owner_id", "status", "created_at"]),
+    ("ix_sprints_owner_created_at_id", "sprints", ["owner_id", "created_at", "id"]),
+    ("ix_rituals_owner_name", "rituals", ["owner_id", "name"]),
+]
+
+REPLACED = [
+    ("ix_projects_created_at_id", "projects", ["created_at", "id"]),
+    ("ix_projects_updated_at_id", "projects", ["updated_at", "id"]),
+    ("ix_projects_status_created_at", "projects", ["status", "created_at", "id"]),
+    ("ix_projects_priority_created_at", "projects", ["priority", "created_at", "id"]),
+    ("ix_projects_category_created_at", "projects", ["category", "created_at", "id"]),
+    ("ix_projects_due_date", "projects", ["due_date"]),
+    ("ix_sprints_created_at_id", "sprints", ["created_at", "id"]),
+]
+
+
+def upgrade():
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if not inspector.has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    for table in OWNED_TABLES:
+        if "owner_id" not in {column["name"] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("owner_id", sa.String(), nullable=True))
+            # SQLite can't ALTER in a constraint (and doesn't enforce
+            # foreign keys unless asked to); elsewhere add the real FK
+            if connection.dialect.name != "sqlite":
+                op.create_foreign_key(f"fk_{table}_owner_id_users", table, "users", ["owner_id"], ["id"])
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, _ in REPLACED:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade():
+    for name, table, columns in REPLACED:
+        op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    for table in OWNED_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("owner_id")
+    op.drop_table("users")
@@ -0,0 +1,32 @@
+"""Startup state table (schema fingerprint, seed data version)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Creates app_state (normally already built by create_all). Startup
+records the schema fingerprint and seed version there and skips
+create_all, migrations and seeding while they are current.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table("app_state"):
+        op.create_table(
+            "app_state",
+            sa.Column("key", sa.String(), primary_key=True),
+            sa.Column("value", sa.String(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade():
+    op.drop_table("app_state")
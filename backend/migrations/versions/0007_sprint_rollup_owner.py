@@ -0,0 +1,148 @@
+"""Per-owner sprint statistics rollups
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+Adds owner_id to the sprint_rollups primary key so each user's stats
+only count their own sprints ("" is the shared scope). The rollups are
+derived data, so the table is rebuilt and refilled from the sprints
+table rather than altered in place.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the schema and backfill as of this revision; later
+# model changes must not alter what this migration does
+COUNTERS = (
+    "sprints_started",
+    "sprints_completed",
+    "sprints_expired",
+    "sprints_overran",
+    "planned_minutes",
+    "focus_minutes",
+    "overrun_minutes",
+    "distractions",
+)
+SHARED_OWNER = ""
+
+sprints = sa.table(
+    "sprints",
+    sa.column("id", sa.String),
+    sa.column("owner_id", sa.String),
+    sa.column("status", sa.String),
+    sa.column("start_time", sa.DateTime),
+    sa.column("actual_end_time", sa.DateTime),
+    sa.column("duration_minutes", sa.Integer),
+)
+sprint_distractions = sa.table("sprint_distractions", sa.column("id", sa.String), sa.column("sprint_id", sa.String))
+rollups = sa.table(
+    "sprint_rollups",
+    sa.column("owner_id", sa.String),
+    sa.column("period", sa.String),
+    sa.column("period_start", sa.Date),
+    sa.column("updated_at", sa.DateTime),
+    *(sa.column(name) for name in COUNTERS),
+)
+
+
+def _counter_columns():
+    return [
+        sa.Column(name, sa.Float() if name.endswith("_minutes") else sa.Integer(), nullable=False)
+        for name in COUNTERS
+    ]
+
+
+def _period_keys(moment):
+    day = moment.date()
+    return [("day", day), ("week", day - timedelta(days=day.weekday()))]
+
+
+def _contribution(status, start_time, actual_end_time, duration_minutes):
+    contribution = {"sprints_started": 1, "planned_minutes": float(duration_minutes)}
+    if status == "expired":
+        contribution["sprints_expired"] = 1
+    elif status == "completed" and actual_end_time is not None:
+        actual = max(0.0, (actual_end_time - start_time).total_seconds() / 60)
+        contribution["sprints_completed"] = 1
+        contribution["focus_minutes"] = actual
+        contribution["overrun_minutes"] = actual - duration_minutes
+        contribution["sprints_overran"] = 1 if actual > duration_minutes else 0
+    return contribution
+
+
+def backfill(connection):
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    rows = connection.execute(
+        sa.select(
+            sprints.c.owner_id, sprints.c.status, sprints.c.start_time,
+            sprints.c.actual_end_time, sprints.c.duration_minutes,
+        ).where(sprints.c.start_time.is_not(None))
+    )
+    for owner_id, status, start_time, actual_end_time, duration_minutes in rows:
+        owner = SHARED_OWNER if owner_id is None else owner_id
+        for key in _period_keys(start_time):
+            for column, value in _contribution(status, start_time, actual_end_time, duration_minutes).items():
+                totals[(owner, *key)][column] += value
+    counts = connection.execute(
+        sa.select(sprints.c.owner_id, sprints.c.start_time, sa.func.count(sprint_distractions.c.id))
+        .join(sprint_distractions, sprint_distractions.c.sprint_id == sprints.c.id)
+        .where(sprints.c.start_time.is_not(None))
+        .group_by(sprints.c.id, sprints.c.owner_id, sprints.c.start_time)
+    )
+    for owner_id, start_time, count in counts:
+        owner = SHARED_OWNER if owner_id is None else owner_id
+        for key in _period_keys(start_time):
+            totals[(owner, *key)]["distractions"] += count
+
+    now = datetime.utcnow()
+    connection.execute(rollups.delete())
+    if totals:
+        connection.execute(rollups.insert(), [
+            {"owner_id": owner_id, "period": period, "period_start": period_start, "updated_at": now, **counters}
+            for (owner_id, period, period_start), counters in totals.items()
+        ])
+
+
+def upgrade():
+    connection = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(connection).get_columns("sprint_rollups")}
+    if "owner_id" not in columns:
+        op.drop_table("sprint_rollups")
+        op.create_table(
+            "sprint_rollups",
+            sa.Column("owner_id", sa.String(), primary_key=True),
+            sa.Column("period", sa.String(), primary_key=True),
+            sa.Column("period_start", sa.Date(), primary_key=True),
+            *_counter_columns(),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+    backfill(connection)
+
+
+def downgrade():
+    # Fold the per-owner rows back into one row per period
+    op.rename_table("sprint_rollups", "sprint_rollups_by_owner")
+    op.create_table(
+        "sprint_rollups",
+        sa.Column("period", sa.String(), primary_key=True),
+        sa.Column("period_start", sa.Date(), primary_key=True),
+        *_counter_columns(),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    sums = ", ".join(f"SUM({name})" for name in COUNTERS)
+    op.execute(
+        f"INSERT INTO sprint_rollups (period, period_start, {', '.join(COUNTERS)}, updated_at) "
+        f"SELECT period, period_start, {sums}, MAX(updated_at) FROM sprint_rollups_by_owner "
+        "GROUP BY period, period_start"
+    )
+    op.drop_table("sprint_rollups_by_owner")
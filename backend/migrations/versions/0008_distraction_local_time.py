@@ -0,0 +1,71 @@
+"""Distraction timestamps on the sprint's clock
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Distraction timestamps used to be written with datetime.utcnow() while
+sprint start and end times are local wall-clock values from
+datetime.now(). New rows are written in local time; this moves the rows
+stored before that onto the same clock, using this host's time zone
+(the one the sprint times were written in), DST included.
+"""
+
+from datetime import timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+sprint_distractions = sa.table(
+    "sprint_distractions",
+    sa.column("id", sa.String),
+    sa.column("timestamp", sa.DateTime),
+)
+
+
+def _utc_to_local(moment):
+    return moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def _local_to_utc(moment):
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _convert(convert):
+    """Rewrite every timestamp with `convert`, in id order and batches"""
+    connection = op.get_bind()
+    table = sprint_distractions
+    update = table.update().where(table.c.id == sa.bindparam("row_id")).values(timestamp=sa.bindparam("moment"))
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.timestamp)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        changed = [
+            {"row_id": row_id, "moment": convert(moment)}
+            for row_id, moment in rows
+            if moment is not None
+        ]
+        if changed:
+            connection.execute(update, changed)
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    _convert(_utc_to_local)
+
+
+def downgrade():
+    _convert(_local_to_utc)
@@ -1,5 +1,6 @@
-from .sprint import Sprint, SprintDistraction
+from .user import User
+from .sprint import Sprint, SprintDistraction, SprintRollup
 from .project import Project
 from .ritual import Ritual, RitualStep
 
-__all__ = ["Sprint", "SprintDistraction", "Project", "Ritual", "RitualStep"]
\ No newline at end of file
+__all__ = ["User", "Sprint", "SprintDistraction", "SprintRollup", "Project", "Ritual", "RitualStep"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from core.database import Base
 from datetime import datetime
@@ -7,8 +7,20 @@ import uuid
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Every list query is scoped to one owner, so each index leads with
+        # owner_id, then an equality filter of the project query API, then
+        # the default (created_at, id) keyset ordering
+        Index("ix_projects_owner_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_projects_owner_updated_at_id", "owner_id", "updated_at", "id"),
+        Index("ix_projects_owner_status_created_at", "owner_id", "status", "created_at", "id"),
+        Index("ix_projects_owner_priority_created_at", "owner_id", "priority", "created_at", "id"),
+        Index("ix_projects_owner_category_created_at", "owner_id", "category", "created_at", "id"),
+        Index("ix_projects_owner_due_date", "owner_id", "due_date"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    owner_id = Column(String, ForeignKey("users.id"), nullable=True)  # NULL: shared/anonymous
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String, default="active")  # active, completed, on_hold, cancelled
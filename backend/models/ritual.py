@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from core.database import Base
@@ -8,8 +8,12 @@ import uuid
 
 class Ritual(Base):
     __tablename__ = "rituals"
+    __table_args__ = (
+        Index("ix_rituals_owner_name", "owner_id", "name"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    owner_id = Column(String, ForeignKey("users.id"), nullable=True)  # NULL: shared default
     name = Column(String, nullable=False)  # "morning", "evening"
     title = Column(String, nullable=False)  # "Morning Ritual", "Evening Ritual"
     description = Column(Text, nullable=True)
@@ -27,7 +31,7 @@ class RitualStep(Base):
     __tablename__ = "ritual_steps"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    ritual_id = Column(String, ForeignKey("rituals.id"), nullable=False)
+    ritual_id = Column(String, ForeignKey("rituals.id"), nullable=False, index=True)
     step_text = Column(Text, nullable=False)
     order = Column(Integer, nullable=False)
     is_required = Column(Boolean, default=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Text, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from core.database import Base
@@ -8,15 +8,24 @@ import uuid
 
 class Sprint(Base):
     __tablename__ = "sprints"
+    __table_args__ = (
+        # Active sprints across all owners, for the expiry scheduler
+        Index("ix_sprints_status_created_at", "status", "created_at"),
+        # One owner's active sprint: status == 'active' ORDER BY created_at DESC
+        Index("ix_sprints_owner_status_created_at", "owner_id", "status", "created_at"),
+        # One owner's sprint history, newest first, keyset-paginated on (created_at, id)
+        Index("ix_sprints_owner_created_at_id", "owner_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    owner_id = Column(String, ForeignKey("users.id"), nullable=True)  # NULL: shared/anonymous
     task = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     duration_minutes = Column(Integer, nullable=False)
     start_time = Column(DateTime, default=datetime.utcnow)
     end_time = Column(DateTime, nullable=True)
     actual_end_time = Column(DateTime, nullable=True)
-    status = Column(String, default="active")  # active, completed, cancelled
+    status = Column(String, default="active")  # active, completed, expired, cancelled
     retrospective = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -29,10 +38,31 @@ class SprintDistraction(Base):
     __tablename__ = "sprint_distractions"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    sprint_id = Column(String, ForeignKey("sprints.id"), nullable=False)
+    sprint_id = Column(String, ForeignKey("sprints.id"), nullable=False, index=True)
     distraction = Column(Text, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    # Local wall-clock, the same clock as Sprint.start_time/end_time
+    timestamp = Column(DateTime, default=datetime.now)
     addressed = Column(Boolean, default=False)
     
     # Relationship to sprint
-    sprint = relationship("Sprint", back_populates="distractions")
\ No newline at end of file
+    sprint = relationship("Sprint", back_populates="distractions")
+
+
+class SprintRollup(Base):
+    """Incrementally maintained sprint statistics per owner, day and ISO week"""
+    __tablename__ = "sprint_rollups"
+
+    # Owner of the sprints counted here; primary key columns can't be NULL,
+    # so the shared scope is stored as "" (see core.sprint_stats.rollup_owner)
+    owner_id = Column(String, primary_key=True, default="")
+    period = Column(String, primary_key=True)  # day, week
+    period_start = Column(Date, primary_key=True)  # the day, or the Monday of the week
+    sprints_started = Column(Integer, nullable=False, default=0)
+    sprints_completed = Column(Integer, nullable=False, default=0)
+    sprints_expired = Column(Integer, nullable=False, default=0)
+    sprints_overran = Column(Integer, nullable=False, default=0)
+    planned_minutes = Column(Float, nullable=False, default=0.0)
+    focus_minutes = Column(Float, nullable=False, default=0.0)
+    overrun_minutes = Column(Float, nullable=False, default=0.0)
+    distractions = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,27 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# The app reads its settings at import time; point it at a throwaway
+# database before anything from core/ or main is imported. Only
+# production mode honours DATABASE_URL, see core/config.py
+_database_dir = tempfile.mkdtemp(prefix="assistant-test-")
+atexit.register(shutil.rmtree, _database_dir, ignore_errors=True)
+os.environ["ENVIRONMENT"] = "production"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+
+# Every request a test makes is checked against ENDPOINT_QUERY_BUDGETS
+pytest_plugins = ["core.query_budget"]
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    # Entering the client runs the lifespan: schema setup and seed data
+    with TestClient(app) as client:
+        yield client
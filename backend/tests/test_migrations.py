@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from core import database
+from core.database import Base, run_migrations
+
+# The schema as create_all built it before the first migration
+BASELINE_SCHEMA = """
+CREATE TABLE sprints (
+    id VARCHAR NOT NULL, task VARCHAR NOT NULL, description TEXT, duration_minutes INTEGER NOT NULL,
+    start_time DATETIME, end_time DATETIME, actual_end_time DATETIME, status VARCHAR, retrospective TEXT,
+    created_at DATETIME, updated_at DATETIME, PRIMARY KEY (id)
+);
+CREATE TABLE projects (
+    id VARCHAR NOT NULL, title VARCHAR NOT NULL, description TEXT, status VARCHAR, priority VARCHAR,
+    category VARCHAR, created_at DATETIME, updated_at DATETIME, due_date DATETIME, completed_at DATETIME,
+    progress_percentage INTEGER, notes TEXT, is_high_priority BOOLEAN, is_completed BOOLEAN, PRIMARY KEY (id)
+);
+CREATE TABLE rituals (
+    id VARCHAR NOT NULL, name VARCHAR NOT NULL, title VARCHAR NOT NULL, description TEXT,
+    estimated_duration_minutes INTEGER, is_active BOOLEAN, created_at DATETIME, updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE TABLE sprint_distractions (
+    id VARCHAR NOT NULL, sprint_id VARCHAR NOT NULL, distraction TEXT NOT NULL, timestamp DATETIME,
+    addressed BOOLEAN, PRIMARY KEY (id), FOREIGN KEY(sprint_id) REFERENCES sprints (id)
+);
+CREATE TABLE ritual_steps (
+    id VARCHAR NOT NULL, ritual_id VARCHAR NOT NULL, step_text TEXT NOT NULL, "order" INTEGER NOT NULL,
+    is_required BOOLEAN, estimated_minutes INTEGER, created_at DATETIME, PRIMARY KEY (id),
+    FOREIGN KEY(ritual_id) REFERENCES rituals (id)
+);
+INSERT INTO sprints (id, task, duration_minutes, start_time, end_time, actual_end_time, status)
+VALUES ('s1', 'Write report', 25, '2026-10-01 09:00:00', '2026-10-01 09:25:00', '2026-10-01 09:30:00', 'completed');
+INSERT INTO sprint_distractions (id, sprint_id, distraction, timestamp, addressed)
+VALUES ('d1', 's1', 'phone', '2026-10-01 09:10:00', 0);
+INSERT INTO projects (id, title, description, status) VALUES ('p1', 'Garden', 'Plant the bulbs', 'active');
+"""
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        connection.connection.executescript(BASELINE_SCHEMA)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("create_all_first", [False, True], ids=["migrations-only", "as-init_db"])
+def test_baseline_database_upgrades_to_head(baseline_engine, create_all_first):
+    if create_all_first:
+        # init_db runs create_all before the migrations
+        Base.metadata.create_all(bind=baseline_engine)
+    run_migrations(baseline_engine)
+
+    with baseline_engine.connect() as connection:
+        heads = connection.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+        rollups = connection.execute(text(
+            "SELECT owner_id, period, sprints_completed, distractions FROM sprint_rollups ORDER BY period"
+        )).all()
+        distracted_at = connection.execute(text("SELECT timestamp FROM sprint_distractions")).scalar()
+        matches = connection.execute(text("SELECT ref_id FROM search_project WHERE search_project MATCH 'bulbs'")).all()
+    assert heads == [_head_revision()]
+    assert "owner_id" in {column["name"] for column in inspect(baseline_engine).get_columns("sprints")}
+    assert rollups == [("", "day", 1, 1), ("", "week", 1, 1)]
+    assert len(matches) == 1
+    # Stored in UTC before 0008, on the sprint's local clock after it
+    utc = datetime(2026, 10, 1, 9, 10, tzinfo=timezone.utc)
+    assert datetime.fromisoformat(distracted_at) == utc.astimezone().replace(tzinfo=None)
+
+
+def test_init_db_raises_when_migrations_fail(monkeypatch):
+    def broken_migrations():
+        raise RuntimeError("migration failed")
+
+    monkeypatch.setattr(database, "get_app_state", lambda key: None)
+    monkeypatch.setattr(database, "run_migrations", broken_migrations)
+    with pytest.raises(RuntimeError, match="migration failed"):
+        asyncio.run(database.init_db())
+
+
+def _head_revision():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(Config(f"{database.BACKEND_DIR}/alembic.ini")).get_current_head()
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import select
+
+from core.auth import request_owner
+from core.database import AsyncSessionLocal
+from core.query_budget import QueryBudgetExceeded
+from models import Project
+
+
+@pytest.mark.parametrize("path", [
+    "/api/projects/",
+    "/api/assistant/sprint/active",
+    "/api/assistant/sprint/all",
+    "/api/assistant/sprint/stats",
+    "/api/assistant/rituals/morning",
+    "/api/search/?q=project",
+])
+def test_hot_endpoint_stays_within_budget(client, path):
+    assert client.get(path).status_code == 200
+
+
+def test_unchanged_list_revalidates_without_queries(client, query_budget):
+    etag = client.get("/api/projects/").headers["etag"]
+    with query_budget(0):
+        response = client.get("/api/projects/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_per_row_query_exceeds_budget(client, query_budget, monkeypatch):
+    async def owner_with_per_row_lookups():
+        # An N+1 slipped into the request: one extra query per project
+        async with AsyncSessionLocal() as db:
+            for project_id in (await db.execute(select(Project.id))).scalars().all():
+                await db.execute(select(Project.title).where(Project.id == project_id))
+        return None
+
+    monkeypatch.setitem(client.app.dependency_overrides, request_owner, owner_with_per_row_lookups)
+    assert client.get("/api/projects/").status_code == 200
+
+    with pytest.raises(QueryBudgetExceeded, match=r"GET /api/projects/ ran \d+ queries, budget is 1"):
+        query_budget.verify()
+    # Expected overrun; don't let the plugin fail this test for it
+    query_budget.violations.clear()
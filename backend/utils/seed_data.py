@@ -4,12 +4,17 @@ Seed initial data from docs/initial/anchor_chat_summary.md
 
 from sqlalchemy.orm import Session
 from models import Project, Ritual, RitualStep, Sprint
-from core.database import get_db_session
+from core.database import session_scope, get_app_state, set_app_state
+from core.sprint_stats import backfill_rollups
 import logging
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Bump when the seed data below changes so existing databases get it on
+# their next startup; while it matches app_state, seeding is skipped
+SEED_VERSION = "1"
+
 
 def seed_initial_projects(db: Session):
     """Seed projects from anchor chat summary"""
@@ -214,24 +219,28 @@ def seed_initial_sprints(db: Session):
         )
         db.add(active_sprint)
 
+    db.flush()
+    backfill_rollups(db.connection())
     db.commit()
     logger.info("Seeded initial sprint examples")
 
 
-def seed_all_data():
-    """Seed all initial data"""
+def seed_all_data(force: bool = False):
+    """Seed all initial data, unless this database already has the current SEED_VERSION"""
+    if not force and get_app_state("seed_version") == SEED_VERSION:
+        logger.info(f"Seed data is current (version {SEED_VERSION})")
+        return
     try:
-        db = get_db_session()
-        seed_initial_projects(db)
-        seed_initial_rituals(db)
-        seed_initial_sprints(db)
+        with session_scope() as db:
+            seed_initial_projects(db)
+            seed_initial_rituals(db)
+            seed_initial_sprints(db)
+        set_app_state("seed_version", SEED_VERSION)
         logger.info("All initial data seeded successfully")
     except Exception as e:
         logger.error(f"Error seeding data: {e}")
         raise
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
-    seed_all_data()
\ No newline at end of file
+    seed_all_data(force=True)
\ No newline at end of file
@@ -24,13 +24,12 @@ if [ ! -f "ai_assistant.db" ] || [ ! -s "ai_assistant.db" ]; then
 else
     echo "✅ Database already exists, checking data..."
     python -c "
-from core.database import get_db_session
+from core.database import session_scope
 from models import Project, Ritual
 try:
-    db = get_db_session()
-    project_count = db.query(Project).count()
-    ritual_count = db.query(Ritual).count()
-    db.close()
+    with session_scope() as db:
+        project_count = db.query(Project).count()
+        ritual_count = db.query(Ritual).count()
     print(f'📊 Database contains {project_count} projects and {ritual_count} rituals')
     if project_count == 0 or ritual_count == 0:
         print('⚠️  Database exists but missing data, re-seeding...')